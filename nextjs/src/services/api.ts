@@ -54,7 +54,10 @@ async function fetchApi<T>(
 export const sessionApi = {
   // 세션 목록 조회
   getSessions: async (skip = 0, limit = 20): Promise<ChatSession[]> => {
-    return fetchApi(`/chats?skip=${skip}&limit=${limit}`);
+    // 목록에서는 메시지가 필요 없으므로 세션 필드만 요청
+    return fetchApi(
+      `/chats?skip=${skip}&limit=${limit}&fields=id,title,created_at,updated_at,is_active`
+    );
   },
 
   // 세션 조회
@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import chat, chat_completion, health
+from app.api.v1.endpoints import chat, chat_completion, export, health, metrics, usage
 
 api_router = APIRouter()
 
@@ -10,5 +10,14 @@ api_router.include_router(chat.router, prefix="/chats", tags=["chats"])
 # 채팅 완성 엔드포인트 등록
 api_router.include_router(chat_completion.router, prefix="", tags=["chat_completion"])
 
+# 사용량 조회 엔드포인트 등록
+api_router.include_router(usage.router, prefix="/usage", tags=["usage"])
+
+# 턴 성능 분석 엔드포인트 등록
+api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
+
+# 대화 데이터 내보내기 엔드포인트 등록
+api_router.include_router(export.router, prefix="/export", tags=["export"])
+
 # 서버 상태 확인 엔드포인트 등록
 api_router.include_router(health.router, prefix="/health", tags=["health"])
\ No newline at end of file
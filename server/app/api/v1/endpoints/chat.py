@@ -1,25 +1,75 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import ORJSONResponse
+from typing import List, Optional, Sequence
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.services.chat_session_crud import chat_session_crud
 from app.services.message_crud import message_crud
-from app.schemas.chat import ChatSession, ChatSessionCreate, ChatSessionUpdate, Message
+from app.services.archive import archive_service
+from app.services.search import search_service
+from app.schemas.chat import (
+    ChatSession, ChatSessionCreate, ChatSessionUpdate, Message,
+    ChatSessionBulkDelete, ChatSessionBulkTitleUpdate, BulkOperationResult,
+    MessageSearchResult
+)
 
 router = APIRouter()
 
+# fields= 파라미터로 선택 가능한 필드 (응답 스키마 기준)
+SESSION_FIELDS = list(ChatSession.model_fields)
+MESSAGE_FIELDS = list(Message.model_fields)
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str]) -> List[str]:
+    """
+    `fields=id,title` 형식의 쿼리 값을 필드 목록으로 변환합니다. 값이 없으면 전체 필드를 반환합니다.
+    """
+    if fields is None:
+        return list(allowed)
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    if not requested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="fields must name at least one field"
+        )
+    unknown = [field for field in requested if field not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    return requested
+
 @router.get("/", response_model=List[ChatSession])
 def get_chat_sessions(
     skip: int = 0, 
     limit: int = 20,
+    fields: Optional[str] = Query(None, description="반환할 필드 (쉼표 구분). messages 를 빼면 메시지를 읽지 않습니다."),
     db: Session = Depends(get_db)
 ):
     """
     채팅 세션 목록을 조회합니다.
     """
-    chat_sessions = chat_session_crud.get_recent_sessions(db, limit=limit)
-    return chat_sessions
+    selected = parse_fields(fields, SESSION_FIELDS)
+    # 응답 모델 검증을 거치지 않고 조회한 컬럼을 바로 직렬화
+    chat_sessions = chat_session_crud.get_recent_session_rows(
+        db, fields=selected, message_fields=MESSAGE_FIELDS, limit=limit
+    )
+    return ORJSONResponse(chat_sessions)
+
+@router.get("/search", response_model=MessageSearchResult)
+def search_chat_messages(
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """
+    활성 채팅 세션의 메시지를 전문 검색합니다.
+    """
+    total, items = search_service.search(db, query=q, skip=skip, limit=limit)
+    return MessageSearchResult(query=q, total=total, skip=skip, limit=limit, items=items)
 
 @router.get("/{chat_id}", response_model=ChatSession)
 def get_chat_session(
@@ -69,11 +119,50 @@ def delete_chat_session(
         )
     return None
 
+@router.post("/bulk-delete", response_model=BulkOperationResult)
+def bulk_delete_chat_sessions(
+    bulk_data: ChatSessionBulkDelete,
+    db: Session = Depends(get_db)
+):
+    """
+    여러 채팅 세션을 한 번에 삭제합니다 (소프트 삭제).
+    """
+    affected = chat_session_crud.bulk_delete_sessions(db, session_ids=bulk_data.ids)
+    return BulkOperationResult(affected=affected)
+
+@router.patch("/bulk-title", response_model=BulkOperationResult)
+def bulk_update_chat_titles(
+    bulk_data: ChatSessionBulkTitleUpdate,
+    db: Session = Depends(get_db)
+):
+    """
+    여러 채팅 세션의 제목을 한 번에 변경합니다.
+    """
+    titles = {item.id: item.title for item in bulk_data.items}
+    affected = chat_session_crud.bulk_update_titles(db, titles=titles)
+    return BulkOperationResult(affected=affected)
+
+@router.post("/{chat_id}/restore", response_model=ChatSession)
+def restore_chat_session(
+    chat_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    보관된 채팅 세션을 복원합니다.
+    """
+    if not archive_service.restore_session(db, session_id=chat_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Archived chat session not found"
+        )
+    return chat_session_crud.get_session_by_id(db, session_id=chat_id)
+
 @router.get("/{chat_id}/messages", response_model=List[Message])
 def get_chat_messages(
     chat_id: int,
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[str] = Query(None, description="반환할 필드 (쉼표 구분). content 를 빼면 본문을 읽지 않습니다."),
     db: Session = Depends(get_db)
 ):
     """
@@ -87,5 +176,6 @@ def get_chat_messages(
             detail="Chat session not found"
         )
     
-    messages = message_crud.get_messages_by_session(db, session_id=chat_id, skip=skip, limit=limit)
-    return messages
+    selected = parse_fields(fields, MESSAGE_FIELDS)
+    messages = message_crud.get_message_rows(db, session_id=chat_id, fields=selected, skip=skip, limit=limit)
+    return ORJSONResponse(messages)
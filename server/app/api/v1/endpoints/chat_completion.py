@@ -1,16 +1,19 @@
 import json
 import time
-from typing import Dict, Any
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Dict, Any, Optional
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-import httpx
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from app.core.database import get_db
 from app.core.config import settings
 from app.services.chat_session_crud import ChatSessionCRUD
 from app.services.message_crud import MessageCRUD
+from app.services.metrics import metrics_service
+from app.services.rate_limit import rate_limiter, resolve_rate_limit_keys
 from app.schemas.chat import MessageCreate, ChatSessionUpdate
 
 router = APIRouter()
@@ -19,151 +22,276 @@ message_crud = MessageCRUD()
 
 class ChatCompletionRequest(BaseModel):
     chat_id: int
-    message: str
+    message: str = Field(..., min_length=1)
+
+
+def sse_event(event: str, data: Dict[str, Any]) -> str:
+    """
+    SSE 이벤트 문자열을 만듭니다.
+    이벤트 순서: start → delta* → usage? → done | error
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def upstream_error(status_code: int, code: str, message: str, upstream_status: Optional[int] = None) -> HTTPException:
+    """ 스트림 시작 전 실패를 구분 가능한 코드와 함께 반환합니다. """
+    detail = {"code": code, "message": message}
+    if upstream_status is not None:
+        detail["upstream_status"] = upstream_status
+    return HTTPException(status_code=status_code, detail=detail)
+
 
 @router.post("/chat")
 async def create_chat_completion(
     request: ChatCompletionRequest,
+    http_request: Request,
     db: Session = Depends(get_db)
 ):
     """채팅 완성 API (스트리밍)"""
+    # 호출자별 요청 속도 / 토큰 예산 확인 (초과 시 429 + Retry-After)
+    rate_limit_keys = resolve_rate_limit_keys(http_request, request.chat_id)
+    await rate_limiter.acheck(*rate_limit_keys)
+
+    # 이 턴에서 DB 작업에 쓴 시간 (턴 성능 기록용)
+    db_started = time.perf_counter()
+
+    # 채팅 세션 확인
+    chat_session = chat_crud.get_session_by_id(db, request.chat_id)
+    if not chat_session or not chat_session.is_active:
+        raise HTTPException(status_code=404, detail="Chat session not found")
+    needs_title = not chat_session.title or chat_session.title.strip() == ""
+
+    # 대화 기록 가져오기 (이번 사용자 메시지는 아직 저장하지 않음)
+    conversation_history = message_crud.get_conversation_history(db, request.chat_id, include_system=False)
+    db_ms = (time.perf_counter() - db_started) * 1000
+
+    # DeepAuto API 요청 준비
+    messages = []
+    for msg in conversation_history:
+        # 빈 내용과 완료되지 않은 턴(사용자 메시지와 응답 모두) 제외
+        if msg.content.strip() and msg.status in (None, "complete"):
+            messages.append({
+                "role": msg.role,
+                "content": msg.content
+            })
+    messages.append({"role": "user", "content": request.message})
+
+    payload = {
+        "model": "deepauto/qwq-32b",
+        "messages": messages,
+        "stream": True,
+        # 마지막 청크로 실제 토큰 사용량을 받음 (토큰 예산/성능 기록에 사용)
+        "stream_options": {"include_usage": True},
+        "max_tokens": 2000,
+        "temperature": 0.7
+    }
+
+    headers = {
+        "Authorization": f"Bearer {settings.DEEPAUTO_API_KEY}",
+        "Content-Type": "application/json"
+    }
+
+    # DeepAuto API URL 구성 (v1 경로 확인)
+    base_url = settings.DEEPAUTO_BASE_URL
+    if not base_url.endswith('/v1'):
+        base_url = base_url.rstrip('/') + '/v1'
+    api_url = f"{base_url}/chat/completions"
+
+    # 스트리밍 동안 커넥션을 점유하지 않도록 세션을 반환
+    # (첫 토큰 이후 저장 시 같은 세션이 풀에서 새 커넥션을 가져옴)
+    db.close()
+
+    start_time = time.time()
+
+    def record_failed_turn(upstream_status: Optional[int], upstream_ms: Optional[int] = None) -> None:
+        """ 스트림 시작 전에 실패한 턴은 메시지 없이 성능 기록만 남깁니다. (스레드풀에서 실행) """
+        try:
+            metrics_service.save_turn(
+                db,
+                request.chat_id,
+                model=payload["model"],
+                outcome="failed",
+                upstream_status=upstream_status,
+                upstream_ms=upstream_ms,
+                total_ms=int((time.time() - start_time) * 1000),
+                db_ms=int(db_ms),
+                retries=0,
+            )
+        finally:
+            db.close()
+
+    # 업스트림이 요청을 수락했는지 스트림 시작 전에 확인 (실패 시 메시지 저장 없이 즉시 반환)
+    import httpx  # lifespan 에서 이미 로드됨
+
+    client = http_request.app.state.http_client
     try:
-        # 채팅 세션 확인
-        chat_session = chat_crud.get_session_by_id(db, request.chat_id)
-        if not chat_session:
-            raise HTTPException(status_code=404, detail="Chat session not found")
-        
-        # 세션 제목 업데이트 (제목이 비어있는 경우에만)
-        if not chat_session.title or chat_session.title.strip() == "":
+        upstream = await client.send(
+            client.build_request("POST", api_url, json=payload, headers=headers),
+            stream=True
+        )
+    except httpx.TimeoutException:
+        await run_in_threadpool(record_failed_turn, None)
+        raise upstream_error(status.HTTP_504_GATEWAY_TIMEOUT, "upstream_timeout", "Upstream request timed out")
+    except httpx.HTTPError as e:
+        await run_in_threadpool(record_failed_turn, None)
+        raise upstream_error(status.HTTP_502_BAD_GATEWAY, "upstream_unavailable", str(e))
+    upstream_ms = int((time.time() - start_time) * 1000)
+
+    if upstream.status_code != 200:
+        reason = upstream.reason_phrase
+        await upstream.aclose()
+        await run_in_threadpool(record_failed_turn, upstream.status_code, upstream_ms)
+        raise upstream_error(
+            status.HTTP_502_BAD_GATEWAY,
+            "upstream_error",
+            f"Server error '{upstream.status_code} {reason}' for url '{api_url}'",
+            upstream_status=upstream.status_code
+        )
+
+    def save_user_turn() -> Optional[int]:
+        """ 첫 토큰 수신 시 사용자 메시지(와 세션 제목)를 저장합니다. """
+        if needs_title:
             session_title = (
                 request.message[:30] + "..."
                 if len(request.message) > 30
                 else request.message
             )
-            session_update_data = ChatSessionUpdate(title=session_title)
-            chat_crud.update_session(db, request.chat_id, session_update_data)
-        
-        # 사용자 메시지 저장
-        user_message_data = MessageCreate(
-            role="user",
-            content=request.message
+            chat_crud.update_session(db, request.chat_id, ChatSessionUpdate(title=session_title))
+        db_user_message = message_crud.create_message(
+            db, MessageCreate(role="user", content=request.message), request.chat_id
         )
-        db_user_message = message_crud.create_message(db, user_message_data, request.chat_id)
-        
-        # 어시스턴트 메시지 초기 생성 (빈 내용으로)
-        assistant_message_data = MessageCreate(
-            role="assistant", 
-            content=""
-        )
-        db_assistant_message = message_crud.create_message(db, assistant_message_data, request.chat_id)
-        
-        # 대화 기록 가져오기
-        conversation_history = message_crud.get_conversation_history(db, request.chat_id, include_system=False)
-        
-        # DeepAuto API 요청 준비
-        messages = []
-        for msg in conversation_history:
-            if msg.content.strip():  # 빈 내용 제외
-                messages.append({
-                    "role": msg.role,
-                    "content": msg.content
-                })
-        
-        payload = {
-            "model": "deepauto/qwq-32b",
-            "messages": messages,
-            "stream": True,
-            "max_tokens": 2000,
-            "temperature": 0.7
-        }
-        
-        headers = {
-            "Authorization": f"Bearer {settings.DEEPAUTO_API_KEY}",
-            "Content-Type": "application/json"
+        return db_user_message.id if db_user_message else None
+
+    def save_assistant_turn(content: str, usage: Optional[Dict[str, Any]], outcome: str,
+                            response_model: Optional[str], first_token_at: Optional[float],
+                            turn_db_ms: float, user_message_id: Optional[int]) -> Optional[int]:
+        """ 어시스턴트 응답을 내용/메타데이터/턴 성능 기록과 함께 한 번에 저장합니다. """
+        processing_time = int((time.time() - start_time) * 1000)
+        # 업스트림이 usage 를 보내면 실제 값을, 아니면 추정치를 사용
+        usage = usage or {}
+        estimated_tokens = int(len(content.split()) * 1.3)
+        tokens_used = usage.get("total_tokens") or estimated_tokens
+        performance = {
+            "model": response_model or payload["model"],
+            "outcome": outcome,
+            "upstream_status": upstream.status_code,
+            "upstream_ms": upstream_ms,
+            "ttft_ms": int((first_token_at - start_time) * 1000) if first_token_at else None,
+            "total_ms": processing_time,
+            "db_ms": int(turn_db_ms),
+            "retries": 0,  # 업스트림 요청은 재시도하지 않음
+            "prompt_tokens": usage.get("prompt_tokens"),
+            "completion_tokens": usage.get("completion_tokens") or estimated_tokens,
+            "tokens_estimated": not usage.get("completion_tokens"),
         }
-        
-        # DeepAuto API URL 구성 (v1 경로 확인)
-        base_url = settings.DEEPAUTO_BASE_URL
-        if not base_url.endswith('/v1'):
-            base_url = base_url.rstrip('/') + '/v1'
-        api_url = f"{base_url}/chat/completions"
-        
-        start_time = time.time()
-        full_response = ""
-        
-        async def stream_response():
-            nonlocal full_response
-            
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                async with client.stream(
-                    "POST", 
-                    api_url,
-                    json=payload, 
-                    headers=headers
-                ) as response:
-                    if response.status_code != 200:
-                        error_msg = f"Server error '{response.status_code} {response.reason_phrase}' for url '{api_url}'"
-                        yield f"data: {json.dumps({'error': error_msg})}\n\n"
-                        return
-                    
-                    async for line in response.aiter_lines():
-                        if line.startswith("data: "):
-                            chunk_data = line[6:]  # "data: " 제거
-                            if chunk_data.strip() == "[DONE]":
-                                yield f"data: [DONE]\n\n"
-                                break
-                            
-                            try:
-                                chunk_json = json.loads(chunk_data)
-                                if "choices" in chunk_json and len(chunk_json["choices"]) > 0:
-                                    delta = chunk_json["choices"][0].get("delta", {})
-                                    if "content" in delta:
-                                        content = delta["content"]
-                                        if content is not None:
-                                            full_response += content
-                                        
-                                        # 응답 데이터 구성
-                                        response_data = {
-                                            "id": chunk_json.get("id"),
-                                            "object": chunk_json.get("object"),
-                                            "created": chunk_json.get("created"),
-                                            "model": chunk_json.get("model"),
-                                            "choices": [{
-                                                "index": 0,
-                                                "delta": {"content": content},
-                                                "finish_reason": chunk_json["choices"][0].get("finish_reason")
-                                            }]
-                                        }
-                                        yield f"data: {json.dumps(response_data)}\n\n"
-                            except json.JSONDecodeError:
-                                continue
-            
-            # 완료 후 데이터베이스 업데이트
-            if full_response:
-                message_crud.update_message_content(
-                    db, 
-                    message_id=db_assistant_message.id, 
-                    content=full_response
-                )
-                
-                processing_time = int((time.time() - start_time) * 1000)
-                tokens_used = len(full_response.split()) * 1.3
-                message_crud.update_message_metadata(
-                    db,
-                    message_id=db_assistant_message.id,
-                    tokens_used=int(tokens_used),
-                    processing_time=processing_time
-                )
-        
-        return StreamingResponse(
-            stream_response(),
-            media_type="text/plain",
-            headers={
-                "Cache-Control": "no-cache",
-                "Connection": "keep-alive",
-                "Content-Type": "text/plain; charset=utf-8"
-            }
+        db_assistant_message = message_crud.create_message(
+            db,
+            MessageCreate(role="assistant", content=content),
+            request.chat_id,
+            tokens_used=int(tokens_used),
+            processing_time=processing_time,
+            status=outcome,
+            performance=performance
         )
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
+        # 끝나지 않은 턴은 사용자 메시지도 같은 상태로 표시해 다음 요청의 대화 기록에서 제외
+        if outcome != "complete" and user_message_id:
+            message_crud.update_message_status(db, user_message_id, outcome)
+        # 스레드풀에서 실행되므로 공유 백엔드에도 바로 기록
+        for rate_limit_key in rate_limit_keys:
+            rate_limiter.record_tokens(rate_limit_key, int(tokens_used))
+        return db_assistant_message.id if db_assistant_message else None
+
+    async def stream_response():
+        full_response = ""
+        usage = None
+        finish_reason = None
+        user_saved = False
+        user_message_id = None
+        first_token_at = None
+        response_model = None
+        turn_db_ms = db_ms
+        # 클라이언트 연결이 끊겨 제너레이터가 중단되면 'incomplete' 로 남음
+        outcome = "incomplete"
+        assistant_message_id = None
+
+        try:
+            yield sse_event("start", {"chat_id": request.chat_id, "model": payload["model"]})
+
+            async for line in upstream.aiter_lines():
+                if not line.startswith("data: "):
+                    continue
+                chunk_data = line[6:]  # "data: " 제거
+                if chunk_data.strip() == "[DONE]":
+                    break
+
+                try:
+                    chunk_json = json.loads(chunk_data)
+                except json.JSONDecodeError:
+                    continue
+
+                if chunk_json.get("usage"):
+                    usage = chunk_json["usage"]
+                response_model = chunk_json.get("model") or response_model
+                if "choices" in chunk_json and len(chunk_json["choices"]) > 0:
+                    choice = chunk_json["choices"][0]
+                    finish_reason = choice.get("finish_reason") or finish_reason
+                    delta = choice.get("delta", {})
+                    if "content" in delta:
+                        content = delta["content"]
+                        if content:
+                            if not user_saved:
+                                first_token_at = time.time()
+                                db_started = time.perf_counter()
+                                user_message_id = await run_in_threadpool(save_user_turn)
+                                turn_db_ms += (time.perf_counter() - db_started) * 1000
+                                user_saved = True
+                            full_response += content
+
+                        # 응답 데이터 구성 (기존 클라이언트 호환을 위해 OpenAI 청크 형식 유지)
+                        response_data = {
+                            "id": chunk_json.get("id"),
+                            "object": chunk_json.get("object"),
+                            "created": chunk_json.get("created"),
+                            "model": chunk_json.get("model"),
+                            "choices": [{
+                                "index": 0,
+                                "delta": {"content": content},
+                                "finish_reason": choice.get("finish_reason")
+                            }]
+                        }
+                        yield sse_event("delta", response_data)
+
+            outcome = "complete"
+        except httpx.HTTPError as e:
+            outcome = "failed"
+            yield sse_event("error", {"code": "upstream_stream_error", "message": str(e)})
+        finally:
+            # 클라이언트 연결이 끊겨 취소된 중에도 턴 저장과 업스트림 정리가 끝나도록 취소를 막음
+            with anyio.CancelScope(shield=True):
+                # 첫 토큰 이전에 끝난 턴은 아무것도 저장하지 않음
+                if user_saved:
+                    assistant_message_id = await run_in_threadpool(
+                        save_assistant_turn,
+                        full_response, usage, outcome, response_model, first_token_at, turn_db_ms, user_message_id
+                    )
+                # get_db 의 정리는 스트리밍 전에 끝나므로 저장에 쓴 커넥션은 여기서 풀에 반환
+                await run_in_threadpool(db.close)
+                await upstream.aclose()
+
+        if outcome != "complete":
+            return
+        if not full_response:
+            yield sse_event("error", {"code": "empty_response", "message": "Upstream returned no content"})
+            return
+        if usage:
+            yield sse_event("usage", usage)
+        yield sse_event("done", {"message_id": assistant_message_id, "finish_reason": finish_reason})
+
+    return StreamingResponse(
+        stream_response(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+        }
+    )
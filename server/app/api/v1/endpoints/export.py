@@ -0,0 +1,87 @@
+import tempfile
+from datetime import datetime
+from typing import Literal, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.export import export_service
+from app.services.rate_limit import rate_limiter, resolve_rate_limit_key
+
+router = APIRouter()
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _stream_ndjson(filters: dict):
+    """ 응답을 보내는 동안에만 사용할 세션을 직접 열고 닫습니다. """
+    db = SessionLocal()
+    try:
+        yield from export_service.iter_ndjson(db, **filters)
+    finally:
+        db.close()
+
+
+def _write_parquet(filters: dict):
+    # Parquet 는 파일 끝에 메타데이터를 쓰므로 임시 파일에 기록한 뒤 전송 (일정 크기 이상은 디스크 사용)
+    spool = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    db = SessionLocal()
+    try:
+        checkpoint = export_service.write_parquet(db, spool, **filters)
+    except Exception:
+        spool.close()
+        raise
+    finally:
+        db.close()
+    spool.seek(0)
+    return spool, checkpoint
+
+
+def _iter_file(spool):
+    try:
+        while chunk := spool.read(CHUNK_SIZE):
+            yield chunk
+    finally:
+        spool.close()
+
+
+@router.get("/")
+async def export_conversations(
+    request: Request,
+    format: Literal["ndjson", "parquet"] = "ndjson",
+    since_id: Optional[int] = Query(None, ge=0, description="이 메시지 id 이후만 내보냄 (증분 내보내기)"),
+    start: Optional[datetime] = Query(None, description="메시지 생성 시각 하한 (포함)"),
+    end: Optional[datetime] = Query(None, description="메시지 생성 시각 상한 (미포함)"),
+):
+    """
+    세션과 메시지를 메시지 id 순으로 스트리밍 내보냅니다.
+    NDJSON 의 마지막 줄(checkpoint)의 last_message_id 를 다음 요청의 since_id 로 사용합니다.
+    EXPORT_API_ENABLED 로 켠 경우에만 사용할 수 있으며 호출자별 레이트 리밋이 적용됩니다.
+    """
+    if not settings.EXPORT_API_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Export API is disabled")
+    await rate_limiter.acheck(resolve_rate_limit_key(request))
+
+    filters = {"since_id": since_id, "start": start, "end": end}
+    if format == "ndjson":
+        return StreamingResponse(_stream_ndjson(filters), media_type="application/x-ndjson")
+
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Parquet export requires pyarrow"
+        )
+    spool, checkpoint = await run_in_threadpool(_write_parquet, filters)
+    return StreamingResponse(
+        _iter_file(spool),
+        media_type="application/vnd.apache.parquet",
+        headers={
+            "Content-Disposition": 'attachment; filename="conversations.parquet"',
+            "X-Export-Last-Message-Id": str(checkpoint.get("last_message_id") or ""),
+        }
+    )
@@ -1,30 +1,73 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Response, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.config import settings
+from app.core.database import get_engine, get_pool_status
 from app.services.chat_session_crud import chat_session_crud
+from app.utils.cache import CachedValue
 
 router = APIRouter()
 
+
+def _ping_database() -> str:
+    """ 풀에서 커넥션을 빌려 SELECT 1 을 실행합니다. """
+    try:
+        with get_engine().connect() as conn:
+            conn.execute(text("SELECT 1"))
+        return "healthy"
+    except Exception as e:
+        return f"error: {str(e)}"
+
+
+# 프로브가 몰려도 TTL 동안은 DB 핑을 한 번만 수행
+db_ping = CachedValue(_ping_database, ttl=lambda: settings.HEALTH_READY_TTL)
+
+
+@router.get("/live")
+async def check_liveness():
+    """
+    프로세스 생존 여부만 확인합니다. (I/O 없음)
+    """
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def check_readiness(response: Response):
+    """
+    데이터베이스 연결 가능 여부를 확인합니다. 핑 결과는 HEALTH_READY_TTL 동안 캐시됩니다.
+    """
+    db_status = db_ping.get() if db_ping.is_fresh() else await run_in_threadpool(db_ping.get)
+    if db_status != "healthy":
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {
+        "status": "ok" if db_status == "healthy" else "unavailable",
+        "database": db_status
+    }
+
+
 @router.get("/")
-def check_health(db: Session = Depends(get_db)):
+def check_health():
     """
     서버와 데이터베이스 연결 상태를 확인합니다.
     """
-    # 데이터베이스 연결 확인을 위해 활성 세션 수 조회
-    try:
-        active_sessions = chat_session_crud.get_active_session_count(db)
-        db_status = "healthy"
-    except Exception as e:
-        db_status = f"error: {str(e)}"
-    
+    db_status = db_ping.get()
+    active_sessions = None
+    if db_status == "healthy":
+        # 활성 세션 수는 주기적으로 갱신되는 캐시 값을 사용
+        try:
+            active_sessions = chat_session_crud.get_cached_active_session_count()
+        except Exception as e:
+            db_status = f"error: {str(e)}"
+
     return {
         "status": "ok",
         "timestamp": datetime.now().isoformat(),
         "database": {
             "status": db_status,
-            "active_sessions": active_sessions if db_status == "healthy" else None
+            "active_sessions": active_sessions,
+            "pool": get_pool_status()
         },
         "api_version": "v1"
     }
@@ -0,0 +1,32 @@
+from datetime import datetime, timedelta
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.schemas.metrics import LatencySummary
+from app.services.metrics import metrics_service
+
+router = APIRouter()
+
+
+@router.get("/latency", response_model=LatencySummary)
+def get_latency_summary(
+    start: Optional[datetime] = Query(None, description="시작 시각 (UTC, 기본: end 24시간 전)"),
+    end: Optional[datetime] = Query(None, description="종료 시각 (UTC, 기본: 현재)"),
+    bucket: Literal["hour", "day"] = "hour",
+    model: Optional[str] = Query(None, max_length=100),
+    db: Session = Depends(get_db)
+):
+    """
+    모델 x 시간 구간별 TTFT / 전체 응답 시간 백분위수와 처리량을 조회합니다.
+    """
+    end = end or datetime.utcnow()
+    start = start or end - timedelta(hours=24)
+    if start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start must be earlier than end"
+        )
+    return metrics_service.get_latency_summary(db, start=start, end=end, bucket=bucket, model=model)
@@ -0,0 +1,24 @@
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Request, status
+from dataclasses import asdict
+
+from app.core.config import settings
+from app.services.rate_limit import rate_limiter, resolve_rate_limit_keys
+
+router = APIRouter()
+
+@router.get("/")
+def get_usage(request: Request, chat_id: Optional[int] = None):
+    """
+    호출자(API 키, IP 또는 채팅 세션)의 롤링 윈도우 동안 요청 수와 토큰 사용량을 조회합니다.
+    RATE_LIMIT_KEY_STRATEGY=session 이면 chat_id 가 필요합니다.
+    """
+    if settings.RATE_LIMIT_KEY_STRATEGY == "session" and chat_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="chat_id is required when rate limits are applied per session"
+        )
+    # session 전략이면 세션 키, 그 외에는 호출자 키
+    key = resolve_rate_limit_keys(request, chat_id)[-1]
+    return asdict(rate_limiter.get_usage(key))
@@ -0,0 +1,266 @@
+"""
+서버 관리용 CLI
+
+사용 예:
+    python -m app.cli archive --older-than-days 90
+    python -m app.cli restore 42
+    python -m app.cli compress-messages
+    python -m app.cli gc-blobs --dry-run
+    python -m app.cli reindex-search
+    python -m app.cli export --output chats.ndjson --since-id 1200
+    python -m app.cli import chats.ndjson
+    python -m app.cli rollup-metrics
+    python -m app.cli startup-profile --import-budget-ms 1500 --first-request-budget-ms 200
+"""
+import argparse
+import sys
+
+from app.core.database import SessionLocal
+
+
+def cmd_archive(args: argparse.Namespace) -> int:
+    from app.services.archive import archive_service
+
+    db = SessionLocal()
+    try:
+        archived = archive_service.archive_sessions(
+            db,
+            include_inactive=not args.active_only,
+            older_than_days=args.older_than_days,
+            batch_size=args.batch_size,
+            max_batches=args.max_batches,
+        )
+    finally:
+        db.close()
+    print(f"보관된 세션 수: {archived}")
+    return 0
+
+
+def cmd_restore(args: argparse.Namespace) -> int:
+    from app.services.archive import archive_service
+
+    db = SessionLocal()
+    try:
+        restored = archive_service.restore_session(db, session_id=args.session_id)
+    finally:
+        db.close()
+    if not restored:
+        print(f"보관된 세션을 찾을 수 없습니다: {args.session_id}")
+        return 1
+    print(f"세션 복원 완료: {args.session_id}")
+    return 0
+
+
+def cmd_compress_messages(args: argparse.Namespace) -> int:
+    from app.services.message_storage import message_storage_service
+
+    db = SessionLocal()
+    try:
+        converted = message_storage_service.recompress_messages(db, batch_size=args.batch_size)
+    finally:
+        db.close()
+    print(f"압축 저장으로 변환된 메시지 수: {converted}")
+    return 0
+
+
+def cmd_gc_blobs(args: argparse.Namespace) -> int:
+    from app.services.message_storage import message_storage_service
+
+    db = SessionLocal()
+    try:
+        removed = message_storage_service.collect_blob_garbage(
+            db, min_age_seconds=args.min_age_minutes * 60, dry_run=args.dry_run
+        )
+    finally:
+        db.close()
+    print(f"{'삭제 대상' if args.dry_run else '삭제된'} blob 수: {removed}")
+    return 0
+
+
+def cmd_reindex_search(args: argparse.Namespace) -> int:
+    from app.services.search import search_service
+
+    db = SessionLocal()
+    try:
+        indexed = search_service.reindex(db, batch_size=args.batch_size)
+    finally:
+        db.close()
+    print(f"검색 색인된 메시지 수: {indexed}")
+    return 0
+
+
+def _parse_datetime(value: str):
+    from datetime import datetime
+
+    return datetime.fromisoformat(value)
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    import orjson
+    from app.services.export import export_service
+
+    filters = {"since_id": args.since_id, "start": args.start, "end": args.end, "yield_per": args.batch_size}
+    db = SessionLocal()
+    try:
+        if args.format == "parquet":
+            checkpoint = export_service.write_parquet(db, args.output, batch_size=args.batch_size, **filters)
+        else:
+            checkpoint = {}
+            out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+            try:
+                for line in export_service.iter_ndjson(db, **filters):
+                    out.write(line)
+                checkpoint = orjson.loads(line)
+            finally:
+                if out is not sys.stdout.buffer:
+                    out.close()
+    finally:
+        db.close()
+    # 진행 상황은 stderr 로 출력 (stdout 으로 내보내는 경우를 위해)
+    print(
+        f"내보낸 메시지 수: {checkpoint.get('messages', 0)}, last_message_id: {checkpoint.get('last_message_id')}",
+        file=sys.stderr
+    )
+    return 0
+
+
+def cmd_import(args: argparse.Namespace) -> int:
+    from app.services.export import export_service
+
+    db = SessionLocal()
+    try:
+        if args.format == "parquet" or (args.format is None and args.input.endswith(".parquet")):
+            stats = export_service.import_records(
+                db, export_service.iter_parquet_records(args.input), batch_size=args.batch_size
+            )
+        else:
+            source = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+            try:
+                stats = export_service.import_records(
+                    db, export_service.iter_ndjson_records(source), batch_size=args.batch_size
+                )
+            finally:
+                if source is not sys.stdin.buffer:
+                    source.close()
+    finally:
+        db.close()
+    print(
+        f"가져온 세션 수: {stats['sessions']}, 메시지 수: {stats['messages']}, "
+        f"건너뛴 메시지 수: {stats['skipped_messages']}, 세션을 찾지 못한 메시지 수: {stats['orphan_messages']}, "
+        f"본문이 누락된 메시지 수: {stats['missing_content_messages']}"
+    )
+    return 0
+
+
+def cmd_rollup_metrics(args: argparse.Namespace) -> int:
+    from app.services.metrics import metrics_service
+
+    db = SessionLocal()
+    try:
+        rolled_up = metrics_service.rollup(db, since=args.since)
+        rolled_up_until = metrics_service.get_rolled_up_until(db)
+    finally:
+        db.close()
+    print(f"집계된 (시간 구간 x 모델) 수: {rolled_up}, 집계 완료 시각: {rolled_up_until}")
+    return 0
+
+
+def cmd_startup_profile(args: argparse.Namespace) -> int:
+    from app.utils.startup_profile import measure_startup, profile_imports
+
+    entries = profile_imports(args.module)
+    print(f"[import profile: {args.module}] 누적 시간 상위 {args.top}개")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for entry in sorted(entries, key=lambda e: e.cumulative_us, reverse=True)[:args.top]:
+        print(f"{entry.cumulative_us / 1000:>14.1f} {entry.self_us / 1000:>9.1f}  {entry.module}")
+
+    timings = measure_startup(runs=args.runs)
+    print(f"\n[startup] 중앙값 ({args.runs}회)")
+    for name, value in timings.items():
+        print(f"  {name:<17} {value:8.1f} ms")
+
+    # 예산 초과 시 0 이 아닌 종료 코드 (CI 회귀 검사용)
+    failures = []
+    if args.import_budget_ms is not None and timings["import_ms"] > args.import_budget_ms:
+        failures.append(f"import {timings['import_ms']:.1f} ms > budget {args.import_budget_ms} ms")
+    if args.first_request_budget_ms is not None and timings["first_request_ms"] > args.first_request_budget_ms:
+        failures.append(
+            f"first request {timings['first_request_ms']:.1f} ms > budget {args.first_request_budget_ms} ms"
+        )
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    archive = subparsers.add_parser("archive", help="비활성/오래된 세션을 보관 테이블로 이동")
+    archive.add_argument("--older-than-days", type=int, default=None,
+                         help="마지막 갱신 후 지정 일수가 지난 세션도 보관")
+    archive.add_argument("--active-only", action="store_true",
+                         help="비활성 세션은 제외하고 --older-than-days 조건만 적용")
+    archive.add_argument("--batch-size", type=int, default=500)
+    archive.add_argument("--max-batches", type=int, default=None)
+    archive.set_defaults(func=cmd_archive)
+
+    restore = subparsers.add_parser("restore", help="보관된 세션을 복원")
+    restore.add_argument("session_id", type=int)
+    restore.set_defaults(func=cmd_restore)
+
+    compress = subparsers.add_parser("compress-messages", help="기존 메시지 본문을 압축 저장 포맷으로 변환")
+    compress.add_argument("--batch-size", type=int, default=500)
+    compress.set_defaults(func=cmd_compress_messages)
+
+    gc_blobs = subparsers.add_parser("gc-blobs", help="메시지가 참조하지 않는 blob 파일 삭제")
+    gc_blobs.add_argument("--min-age-minutes", type=float, default=60,
+                          help="이보다 최근에 만든 blob 은 유지 (커밋 전 쓰기 보호)")
+    gc_blobs.add_argument("--dry-run", action="store_true", help="삭제하지 않고 대상 개수만 출력")
+    gc_blobs.set_defaults(func=cmd_gc_blobs)
+
+    reindex = subparsers.add_parser("reindex-search", help="모든 메시지로 검색 색인을 다시 생성")
+    reindex.add_argument("--batch-size", type=int, default=500)
+    reindex.set_defaults(func=cmd_reindex_search)
+
+    export = subparsers.add_parser("export", help="세션/메시지를 NDJSON 또는 Parquet 로 내보내기")
+    export.add_argument("--output", "-o", default="-", help="출력 파일 (기본: stdout, Parquet 는 파일 필수)")
+    export.add_argument("--format", choices=["ndjson", "parquet"], default="ndjson")
+    export.add_argument("--since-id", type=int, default=None, help="이 메시지 id 이후만 내보냄 (증분)")
+    export.add_argument("--start", type=_parse_datetime, default=None, help="메시지 생성 시각 하한 (ISO 8601)")
+    export.add_argument("--end", type=_parse_datetime, default=None, help="메시지 생성 시각 상한 (ISO 8601)")
+    export.add_argument("--batch-size", type=int, default=1000)
+    export.set_defaults(func=cmd_export)
+
+    import_ = subparsers.add_parser("import", help="export 로 만든 파일을 일괄 가져오기")
+    import_.add_argument("input", help="입력 파일 (- 는 stdin)")
+    import_.add_argument("--format", choices=["ndjson", "parquet"], default=None,
+                         help="기본: 확장자가 .parquet 이면 Parquet, 아니면 NDJSON")
+    import_.add_argument("--batch-size", type=int, default=1000)
+    import_.set_defaults(func=cmd_import)
+
+    rollup = subparsers.add_parser("rollup-metrics", help="끝난 1시간 구간의 턴 성능 기록을 롤업 테이블로 집계")
+    rollup.add_argument("--since", type=_parse_datetime, default=None,
+                        help="이 시각(UTC)부터 다시 집계 (기본: 마지막 롤업 이후)")
+    rollup.set_defaults(func=cmd_rollup_metrics)
+
+    profile = subparsers.add_parser("startup-profile", help="import 시간과 콜드 스타트 지연을 측정")
+    profile.add_argument("--module", default="app.main")
+    profile.add_argument("--top", type=int, default=25)
+    profile.add_argument("--runs", type=int, default=3)
+    profile.add_argument("--import-budget-ms", type=float, default=None,
+                         help="앱 import 시간이 이 값을 넘으면 실패 (종료 코드 1)")
+    profile.add_argument("--first-request-budget-ms", type=float, default=None,
+                         help="첫 요청 시간이 이 값을 넘으면 실패 (종료 코드 1)")
+    profile.set_defaults(func=cmd_startup_profile)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,7 @@
+from functools import lru_cache
+
 from pydantic_settings import BaseSettings
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Literal
 
 
 class Settings(BaseSettings):
@@ -27,6 +29,53 @@ class Settings(BaseSettings):
     # SQLAlchemy
     SQLALCHEMY_DATABASE_URI: Optional[str] = None
     
+    # 커넥션 풀 설정
+    DB_POOL_SIZE: int = 10  # 상시 유지할 커넥션 수
+    DB_MAX_OVERFLOW: int = 20  # pool_size 초과 시 추가로 허용할 커넥션 수
+    DB_POOL_TIMEOUT: float = 10.0  # 커넥션 대기 최대 시간(초)
+    DB_POOL_RECYCLE: int = 1800  # 커넥션 재생성 주기(초), MySQL wait_timeout 보다 짧아야 함
+    # "pre_ping": 체크아웃마다 SELECT 1 로 확인 / "recycle": pool_recycle 주기에만 의존
+    DB_POOL_PING_STRATEGY: Literal["pre_ping", "recycle"] = "pre_ping"
+    DB_POOL_WARMUP: int = 5  # 서버 시작 시 미리 열어둘 커넥션 수 (0 이면 비활성화)
+    
+    # 메시지 본문 저장 설정
+    MESSAGE_COMPRESSION: Literal["none", "zlib", "zstd"] = "zlib"  # zstd 는 zstandard 패키지 필요
+    MESSAGE_COMPRESSION_MIN_BYTES: int = 4096  # 이 크기 이상인 본문만 압축
+    MESSAGE_BLOB_THRESHOLD_BYTES: int = 1048576  # 이 크기 이상인 본문은 blob 저장소로 이동 (0 이면 비활성화)
+    # blob 은 DB 밖에 저장되므로 모든 서버 인스턴스(파드)가 같은 경로를 공유해야 함 (예: 공유 볼륨/NFS 마운트)
+    # 인스턴스별 로컬 디스크를 쓰면 다른 인스턴스에서 본문을 읽지 못함. 정리는 `python -m app.cli gc-blobs`
+    MESSAGE_BLOB_DIR: str = "storage/blobs"
+    
+    # 검색 설정
+    SEARCH_BACKEND: Literal["auto", "mysql", "local"] = "auto"  # auto: MySQL 이면 FULLTEXT, 그 외에는 로컬 역색인
+    SEARCH_SNIPPET_CHARS: int = 160  # 검색 결과 하이라이트 스니펫 길이
+    
+    # 레이트 리밋 / 토큰 예산 설정
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: Literal["memory", "redis"] = "memory"  # 다중 워커/파드에서는 redis 사용
+    RATE_LIMIT_REDIS_URL: str = "redis://localhost:6379/0"
+    RATE_LIMIT_KEY_STRATEGY: Literal["api_key", "ip", "session"] = "api_key"  # 헤더가 없거나 등록되지 않은 키면 IP 기준
+    RATE_LIMIT_API_KEY_HEADER: str = "X-API-Key"
+    # 키별 한도를 받을 API 키의 sha256 hex 목록 (app.services.rate_limit.hash_api_key). 목록에 없는 키는 IP 기준
+    RATE_LIMIT_API_KEY_HASHES: List[str] = []
+    RATE_LIMIT_REQUESTS_PER_MINUTE: float = 20.0
+    RATE_LIMIT_BURST: int = 5
+    RATE_LIMIT_TOKEN_BUDGET: int = 200000  # 윈도우당 허용 토큰 수 (0 이면 무제한)
+    RATE_LIMIT_TOKEN_WINDOW_SECONDS: int = 3600
+    
+    # 응답 압축 설정 (SSE 스트림은 압축하지 않음)
+    RESPONSE_COMPRESSION_ENABLED: bool = True
+    RESPONSE_COMPRESSION_MIN_SIZE: int = 1024  # 이 크기 미만의 응답은 압축하지 않음(바이트)
+    RESPONSE_COMPRESSION_GZIP_LEVEL: int = 4  # 큰 히스토리 응답에서 압축률 대비 CPU 비용이 가장 적절한 수준
+    RESPONSE_COMPRESSION_BROTLI_QUALITY: int = 4  # brotli 패키지가 설치된 경우에만 사용
+    
+    # 대화 데이터 내보내기 설정
+    EXPORT_API_ENABLED: bool = False  # GET /export 는 DB 전체를 스트리밍하므로 명시적으로 켠 경우에만 허용
+    
+    # 헬스 체크 설정
+    HEALTH_READY_TTL: float = 5.0  # /ready DB 핑 결과 캐시 시간(초)
+    ACTIVE_SESSION_COUNT_TTL: float = 60.0  # 활성 세션 수를 DB에서 다시 읽는 주기(초)
+    
     @property
     def get_database_url(self) -> str:
         """데이터베이스 URL 생성"""
@@ -40,4 +89,10 @@ class Settings(BaseSettings):
         case_sensitive = True
 
 
-settings = Settings()
+@lru_cache()
+def get_settings() -> Settings:
+    """ 설정 객체를 한 번만 생성합니다. (.env 읽기 포함) """
+    return Settings()
+
+
+settings = get_settings()
@@ -1,17 +1,112 @@
+import threading
+import time
+from typing import Any, Dict, Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from app.core.config import settings
 
-# SQLAlchemy 엔진 생성 - 로컬 개발용 (오직 MySQL, SSL 없음)
-engine = create_engine(
-    settings.get_database_url, 
-    pool_pre_ping=True  # 연결 끊김 방지 위해 연결 상태 확인
-)
+
+class PoolStats:
+    """커넥션 체크아웃 대기 시간 통계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+        self.last_wait_ms = 0.0
+
+    def record_wait(self, wait_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.total_wait_ms += wait_ms
+            self.last_wait_ms = wait_ms
+            if wait_ms > self.max_wait_ms:
+                self.max_wait_ms = wait_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            avg_wait_ms = self.total_wait_ms / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(avg_wait_ms, 3),
+                "max_wait_ms": round(self.max_wait_ms, 3),
+                "last_wait_ms": round(self.last_wait_ms, 3),
+            }
+
+
+pool_stats = PoolStats()
+
+
+class TimedQueuePool(QueuePool):
+    """체크아웃 대기 시간을 기록하는 QueuePool"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except Exception:
+            pool_stats.record_wait((time.perf_counter() - start) * 1000, timed_out=True)
+            raise
+        pool_stats.record_wait((time.perf_counter() - start) * 1000)
+        return conn
+
+
+_engine: Optional[Engine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> Engine:
+    """
+    SQLAlchemy 엔진을 처음 사용할 때 생성합니다. (import 시점에는 엔진을 만들지 않음)
+    풀 크기/재생성 주기/핑 전략은 설정에서 조정합니다.
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_engine(
+                    settings.get_database_url,
+                    poolclass=TimedQueuePool,
+                    pool_size=settings.DB_POOL_SIZE,
+                    max_overflow=settings.DB_MAX_OVERFLOW,
+                    pool_timeout=settings.DB_POOL_TIMEOUT,
+                    pool_recycle=settings.DB_POOL_RECYCLE,
+                    pool_pre_ping=settings.DB_POOL_PING_STRATEGY == "pre_ping",
+                )
+    return _engine
+
+
+def dispose_engine() -> None:
+    """ 엔진과 풀의 커넥션을 모두 닫습니다. """
+    global _engine
+    with _engine_lock:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
+
+
+class LazyEngineSession(Session):
+    """ 쿼리 시점에 get_engine() 으로 엔진을 가져오는 세션 """
+
+    def get_bind(self, mapper=None, **kwargs):
+        if self.bind is not None:
+            return self.bind
+        return get_engine()
+
 
 # 세션 팩토리 생성
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+SessionLocal = sessionmaker(class_=LazyEngineSession, autocommit=False, autoflush=False)
 
 # 모델 베이스 클래스
 Base = declarative_base()
@@ -26,3 +121,36 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def warm_pool(count: Optional[int] = None) -> int:
+    """
+    커넥션 풀을 미리 채워 첫 요청의 연결 비용을 없앱니다.
+    열린 커넥션 수를 반환합니다.
+    """
+    count = min(settings.DB_POOL_WARMUP if count is None else count, settings.DB_POOL_SIZE)
+    engine = get_engine()
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(engine.connect())
+    except Exception as e:
+        print(f"Error warming up connection pool: {e}")
+    finally:
+        for conn in connections:
+            conn.close()
+    return len(connections)
+
+
+def get_pool_status() -> Dict[str, Any]:
+    """커넥션 풀 점유 상태와 체크아웃 대기 시간 통계를 반환합니다."""
+    pool = get_engine().pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "ping_strategy": settings.DB_POOL_PING_STRATEGY,
+        "wait": pool_stats.snapshot(),
+    }
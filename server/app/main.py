@@ -1,14 +1,39 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api.v1.api import api_router
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
+from app.core.database import dispose_engine, get_engine, warm_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # import 시점이 아닌 서버 시작 시 엔진/HTTP 클라이언트 생성
+    import httpx
+
+    get_engine()
+    # 커넥션 풀 예열
+    if settings.DB_POOL_WARMUP > 0:
+        await run_in_threadpool(warm_pool, settings.DB_POOL_WARMUP)
+    # DeepAuto API 호출용 공유 클라이언트 (요청마다 새 연결을 맺지 않도록 재사용)
+    app.state.http_client = httpx.AsyncClient(timeout=30.0)
+    yield
+    await app.state.http_client.aclose()
+    dispose_engine()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description="DeepAuto API",
     version="0.1.0",
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS 설정
@@ -20,6 +45,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 응답 압축 (gzip/brotli)
+if settings.RESPONSE_COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.RESPONSE_COMPRESSION_MIN_SIZE,
+        gzip_level=settings.RESPONSE_COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.RESPONSE_COMPRESSION_BROTLI_QUALITY,
+    )
+
 # API 라우터 포함
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -1,2 +1,5 @@
 from app.models.chat import ChatSession, Message
-from app.models.base import Base, TimestampMixin
\ No newline at end of file
+from app.models.archive import ChatSessionArchive, MessageArchive
+from app.models.search import MessageSearch
+from app.models.metrics import TurnMetric, TurnMetricRollup
+from app.models.base import Base, TimestampMixin
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, String, Boolean, DateTime
+import datetime
+
+from app.models.base import Base
+from app.models.types import CompressedText
+
+
+class ChatSessionArchive(Base):
+    """보관된 채팅 세션 모델 (chat_sessions 와 동일한 컬럼 + 보관 시각)"""
+    __tablename__ = "chat_sessions_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    session_id = Column(String(36), unique=True, index=True)
+    title = Column(String(255), nullable=True)
+    is_active = Column(Boolean, default=False)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+    archived_at = Column(DateTime, default=datetime.datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f"<ChatSessionArchive(id={self.id}, title={self.title})>"
+
+
+class MessageArchive(Base):
+    """보관된 메시지 모델 (messages 와 동일한 컬럼)"""
+    __tablename__ = "messages_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    message_id = Column(String(36), unique=True, index=True)
+    session_id = Column(Integer, nullable=False, index=True)
+    role = Column(String(50))
+    content = Column(CompressedText)  # 큰 본문은 압축/blob 저장 (app.models.types 참고)
+    tokens_used = Column(Integer, nullable=True)
+    processing_time = Column(Integer, nullable=True)
+    status = Column(String(20), nullable=True)
+    created_at = Column(DateTime)
+    updated_at = Column(DateTime)
+
+    def __repr__(self):
+        return f"<MessageArchive(id={self.id}, role={self.role})>"
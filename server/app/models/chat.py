@@ -1,9 +1,10 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, Boolean
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import uuid
 
 from app.models.base import Base, TimestampMixin
+from app.models.types import CompressedText
 
 
 class ChatSession(Base, TimestampMixin):
@@ -30,11 +31,12 @@ class Message(Base, TimestampMixin):
     message_id = Column(String(36), unique=True, index=True, default=lambda: str(uuid.uuid4()))
     session_id = Column(Integer, ForeignKey("chat_sessions.id"), nullable=False)
     role = Column(String(50))  # 'user', 'assistant', 'system' 등
-    content = Column(Text)
+    content = Column(CompressedText)  # 큰 본문은 압축/blob 저장 (app.models.types 참고)
     
     # 추가 메타데이터
     tokens_used = Column(Integer, nullable=True)
     processing_time = Column(Integer, nullable=True)  # 처리 시간(밀리초)
+    status = Column(String(20), nullable=True, default="complete")  # 'complete', 'incomplete'(연결 끊김), 'failed'
     
     # 관계 설정: 메시지는 하나의 세션에 속함
     session = relationship("ChatSession", back_populates="messages")
@@ -0,0 +1,73 @@
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, DateTime, ForeignKey, Index, JSON, UniqueConstraint
+import datetime
+
+from app.models.base import Base
+
+
+class TurnMetric(Base):
+    """
+    채팅 턴 하나의 성능 기록 (어시스턴트 메시지 저장과 같은 트랜잭션에서 기록)
+    스트림 시작 전에 실패한 턴은 message_id 없이 기록됩니다.
+    시간 값은 모두 밀리초입니다.
+    """
+    __tablename__ = "turn_metrics"
+
+    id = Column(Integer, primary_key=True)
+    # 메시지가 삭제/보관되어도 성능 기록은 남김
+    message_id = Column(Integer, ForeignKey("messages.id", ondelete="SET NULL"), nullable=True, unique=True)
+    # 메시지가 보관 테이블로 옮겨진 동안의 원래 message_id (복원 시 message_id 로 되돌림)
+    archived_message_id = Column(Integer, nullable=True)
+    session_id = Column(Integer, nullable=False, index=True)
+    model = Column(String(100), nullable=False)
+    outcome = Column(String(20), nullable=False)  # messages.status 와 동일 ('complete', 'incomplete', 'failed')
+    upstream_status = Column(Integer, nullable=True)
+
+    upstream_ms = Column(Integer, nullable=True)  # 요청 전송 ~ 응답 헤더 수신 (업스트림 대기 시간)
+    ttft_ms = Column(Integer, nullable=True)  # 업스트림 요청 시작 ~ 첫 토큰
+    total_ms = Column(Integer, nullable=False)  # 업스트림 요청 시작 ~ 스트림 종료 (messages.processing_time 과 동일)
+    db_ms = Column(Integer, nullable=True)  # 이 턴에서 DB 작업에 쓴 시간 (최종 저장 제외)
+    retries = Column(Integer, nullable=False, default=0)
+
+    prompt_tokens = Column(Integer, nullable=True)
+    completion_tokens = Column(Integer, nullable=True)
+    tokens_estimated = Column(Boolean, nullable=False, default=False)  # 업스트림 usage 가 없어 추정한 경우
+
+    created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False, index=True)
+
+    __table_args__ = (
+        Index("ix_turn_metrics_model_created_at", "model", "created_at"),
+    )
+
+    def __repr__(self):
+        return f"<TurnMetric(id={self.id}, model={self.model}, total_ms={self.total_ms})>"
+
+
+class TurnMetricRollup(Base):
+    """
+    모델 x 1시간 단위로 미리 집계한 턴 성능 (python -m app.cli rollup-metrics 로 갱신)
+    백분위수 계산을 위해 지연 시간은 고정 구간 히스토그램(app.services.metrics.LATENCY_BUCKETS_MS)으로 저장합니다.
+    """
+    __tablename__ = "turn_metric_rollups"
+
+    id = Column(Integer, primary_key=True)
+    bucket_start = Column(DateTime, nullable=False)
+    model = Column(String(100), nullable=False)
+
+    turns = Column(Integer, nullable=False, default=0)
+    failed_turns = Column(Integer, nullable=False, default=0)
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    # 첫 토큰을 받은 턴의 completion_tokens 합 (stream_ms 와 함께 tokens/sec 계산용)
+    streamed_completion_tokens = Column(Integer, nullable=False, default=0)
+    stream_ms = Column(BigInteger, nullable=False, default=0)  # 첫 토큰 이후 생성 시간 합 (tokens/sec 계산용)
+    ttft_sum_ms = Column(BigInteger, nullable=False, default=0)
+    total_sum_ms = Column(BigInteger, nullable=False, default=0)
+    ttft_histogram = Column(JSON, nullable=False)
+    total_histogram = Column(JSON, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("bucket_start", "model", name="uq_turn_metric_rollups_bucket_model"),
+    )
+
+    def __repr__(self):
+        return f"<TurnMetricRollup(bucket_start={self.bucket_start}, model={self.model}, turns={self.turns})>"
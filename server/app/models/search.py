@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, Text, ForeignKey, Index
+from sqlalchemy.dialects import mysql
+
+from app.models.base import Base
+
+
+class MessageSearch(Base):
+    """
+    메시지 검색용 원문 사본.
+    messages.content 는 압축 저장될 수 있으므로 FULLTEXT 인덱스는 이 테이블에 둡니다.
+    """
+    __tablename__ = "message_search"
+
+    message_id = Column(Integer, ForeignKey("messages.id", ondelete="CASCADE"), primary_key=True)
+    session_id = Column(Integer, nullable=False, index=True)
+    # MySQL TEXT(64KB)로는 긴 본문 색인이 'Data too long' 으로 실패하므로 MEDIUMTEXT 사용
+    content = Column(Text().with_variant(mysql.MEDIUMTEXT(), "mysql"))
+
+    __table_args__ = (
+        # MySQL: 한국어 검색을 위해 ngram 파서 사용
+        Index("ix_message_search_content", "content", mysql_prefix="FULLTEXT", mysql_with_parser="ngram"),
+    )
+
+    def __repr__(self):
+        return f"<MessageSearch(message_id={self.message_id})>"
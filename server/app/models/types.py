@@ -0,0 +1,45 @@
+from functools import lru_cache
+
+from sqlalchemy.dialects import mysql
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+from app.core.config import settings
+from app.utils.compression import ContentCodec, LocalBlobStore
+
+
+@lru_cache()
+def get_content_codec() -> ContentCodec:
+    """ 설정값으로 메시지 본문 코덱을 생성합니다. """
+    blob_store = None
+    if settings.MESSAGE_BLOB_THRESHOLD_BYTES > 0:
+        blob_store = LocalBlobStore(settings.MESSAGE_BLOB_DIR)
+    return ContentCodec(
+        algorithm=settings.MESSAGE_COMPRESSION,
+        min_bytes=settings.MESSAGE_COMPRESSION_MIN_BYTES,
+        blob_threshold_bytes=settings.MESSAGE_BLOB_THRESHOLD_BYTES,
+        blob_store=blob_store,
+    )
+
+
+class CompressedText(TypeDecorator):
+    """
+    큰 본문을 투명하게 압축/외부 저장하는 텍스트 컬럼 타입.
+    DB에는 바이너리로 저장되며 애플리케이션에는 str 로 보입니다.
+    """
+    impl = LargeBinary
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "mysql":
+            return dialect.type_descriptor(mysql.MEDIUMBLOB())
+        return dialect.type_descriptor(LargeBinary())
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return get_content_codec().encode(value)
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return get_content_codec().decode(bytes(value))
@@ -22,6 +22,7 @@ class Message(MessageBase):
     created_at: datetime
     tokens_used: Optional[int] = None
     processing_time: Optional[int] = None
+    status: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -54,3 +55,43 @@ class ChatSession(ChatSessionBase):
 
     class Config:
         from_attributes = True
+
+
+class ChatSessionBulkDelete(BaseModel):
+    """채팅 세션 일괄 삭제 요청 스키마"""
+    ids: List[int] = Field(..., min_length=1, max_length=1000)
+
+
+class ChatSessionTitleItem(BaseModel):
+    """일괄 제목 변경 항목"""
+    id: int
+    title: str = Field(..., max_length=255)
+
+
+class ChatSessionBulkTitleUpdate(BaseModel):
+    """채팅 세션 일괄 제목 변경 요청 스키마"""
+    items: List[ChatSessionTitleItem] = Field(..., min_length=1, max_length=1000)
+
+
+class BulkOperationResult(BaseModel):
+    """일괄 작업 결과 스키마"""
+    affected: int
+
+
+class MessageSearchHit(BaseModel):
+    """메시지 검색 결과 항목"""
+    id: int
+    session_id: int
+    session_title: Optional[str] = None
+    role: str
+    created_at: Optional[datetime] = None
+    snippet: str  # 검색어가 <mark> 태그로 감싸진 본문 일부
+
+
+class MessageSearchResult(BaseModel):
+    """메시지 검색 응답 스키마"""
+    query: str
+    total: int
+    skip: int
+    limit: int
+    items: List[MessageSearchHit]
@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+
+class LatencyPercentiles(BaseModel):
+    """지연 시간 분포 (밀리초, 히스토그램 기반 근사값)"""
+    avg: Optional[float] = None
+    p50: Optional[float] = None
+    p90: Optional[float] = None
+    p99: Optional[float] = None
+
+
+class LatencyBucket(BaseModel):
+    """모델 x 시간 구간별 지연 시간 / 처리량"""
+    bucket_start: datetime
+    model: str
+    turns: int
+    failed_turns: int
+    prompt_tokens: int
+    completion_tokens: int
+    turns_per_minute: float
+    tokens_per_second: Optional[float] = None  # 첫 토큰 이후 생성 속도
+    ttft_ms: LatencyPercentiles
+    total_ms: LatencyPercentiles
+
+
+class LatencySummary(BaseModel):
+    """지연 시간 분석 응답 스키마"""
+    start: datetime
+    end: datetime
+    bucket: str
+    rolled_up_until: Optional[datetime] = None  # 이 시각 이전은 미리 집계된 값 사용
+    items: List[LatencyBucket]
@@ -0,0 +1,133 @@
+import datetime
+from typing import List, Optional
+
+from sqlalchemy import select, insert, update, delete, or_
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.chat import ChatSession, Message
+from app.models.archive import ChatSessionArchive, MessageArchive
+from app.models.metrics import TurnMetric
+from app.services.chat_session_crud import active_session_counter
+from app.services.search import search_service
+
+
+SESSION_COLUMNS = ["id", "session_id", "title", "is_active", "created_at", "updated_at"]
+MESSAGE_COLUMNS = [
+    "id", "message_id", "session_id", "role", "content",
+    "tokens_used", "processing_time", "status", "created_at", "updated_at",
+]
+
+
+def _columns(model, names: List[str]):
+    return [getattr(model, name) for name in names]
+
+
+class ArchiveService:
+    """
+    비활성/오래된 세션과 메시지를 보관 테이블로 옮겨 운영 테이블을 작게 유지합니다.
+    모든 작업은 INSERT ... SELECT / DELETE 집합 연산으로 배치 단위 처리됩니다.
+    """
+
+    def _move_sessions(self, db: Session, session_ids: List[int]) -> None:
+        """ 주어진 세션과 메시지를 보관 테이블로 옮깁니다. (커밋은 호출자가 수행) """
+        db.execute(
+            insert(ChatSessionArchive).from_select(
+                SESSION_COLUMNS,
+                select(*_columns(ChatSession, SESSION_COLUMNS)).where(ChatSession.id.in_(session_ids))
+            )
+        )
+        db.execute(
+            insert(MessageArchive).from_select(
+                MESSAGE_COLUMNS,
+                select(*_columns(Message, MESSAGE_COLUMNS)).where(Message.session_id.in_(session_ids))
+            )
+        )
+        search_service.remove_sessions(db, session_ids)
+        # 턴 성능 기록은 운영 테이블에 남기고, 메시지 연결은 복원할 때까지 archived_message_id 에 보관
+        db.execute(
+            update(TurnMetric)
+            .where(TurnMetric.session_id.in_(session_ids), TurnMetric.message_id.isnot(None))
+            .values(archived_message_id=TurnMetric.message_id, message_id=None)
+        )
+        db.execute(delete(Message).where(Message.session_id.in_(session_ids)))
+        db.execute(delete(ChatSession).where(ChatSession.id.in_(session_ids)))
+
+    def archive_sessions(self, db: Session, include_inactive: bool = True,
+                         older_than_days: Optional[int] = None, batch_size: int = 500,
+                         max_batches: Optional[int] = None) -> int:
+        """
+        비활성 세션 및 older_than_days 이상 갱신되지 않은 세션을 보관합니다.
+        배치마다 커밋하며, 보관된 세션 수를 반환합니다.
+        """
+        conditions = []
+        if include_inactive:
+            conditions.append(ChatSession.is_active == False)
+        if older_than_days is not None:
+            cutoff = datetime.datetime.utcnow() - datetime.timedelta(days=older_than_days)
+            conditions.append(ChatSession.updated_at < cutoff)
+        if not conditions:
+            return 0
+
+        archived = 0
+        batches = 0
+        try:
+            while max_batches is None or batches < max_batches:
+                session_ids = db.execute(
+                    select(ChatSession.id).where(or_(*conditions)).order_by(ChatSession.id).limit(batch_size)
+                ).scalars().all()
+                if not session_ids:
+                    break
+                self._move_sessions(db, session_ids)
+                db.commit()
+                archived += len(session_ids)
+                batches += 1
+        except SQLAlchemyError as e:
+            db.rollback()
+            print(f"Error archiving chat sessions: {e}")
+        finally:
+            if archived:
+                active_session_counter.invalidate()
+        return archived
+
+    def restore_session(self, db: Session, session_id: int) -> bool:
+        """ 보관된 세션과 메시지를 운영 테이블로 되돌립니다. """
+        try:
+            exists = db.execute(
+                select(ChatSessionArchive.id).where(ChatSessionArchive.id == session_id)
+            ).first()
+            if not exists:
+                return False
+
+            db.execute(
+                insert(ChatSession).from_select(
+                    SESSION_COLUMNS,
+                    select(*_columns(ChatSessionArchive, SESSION_COLUMNS)).where(ChatSessionArchive.id == session_id)
+                )
+            )
+            db.execute(
+                insert(Message).from_select(
+                    MESSAGE_COLUMNS,
+                    select(*_columns(MessageArchive, MESSAGE_COLUMNS)).where(MessageArchive.session_id == session_id)
+                )
+            )
+            db.execute(
+                update(TurnMetric)
+                .where(TurnMetric.session_id == session_id, TurnMetric.archived_message_id.isnot(None))
+                .values(message_id=TurnMetric.archived_message_id, archived_message_id=None)
+            )
+            db.execute(delete(MessageArchive).where(MessageArchive.session_id == session_id))
+            db.execute(delete(ChatSessionArchive).where(ChatSessionArchive.id == session_id))
+            for message in db.execute(select(Message).where(Message.session_id == session_id)).scalars().all():
+                if message.content:
+                    search_service.index_message(db, message.id, message.session_id, message.content)
+            db.commit()
+            active_session_counter.invalidate()
+            return True
+        except SQLAlchemyError as e:
+            db.rollback()
+            print(f"Error restoring chat session: {e}")
+            return False
+
+
+archive_service = ArchiveService()
@@ -1,9 +1,26 @@
-from typing import Optional, List
-from sqlalchemy.orm import Session
+from typing import Optional, List, Dict
+from sqlalchemy import update
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.core.config import settings
+from app.core.database import SessionLocal
 from app.models.chat import ChatSession
 from app.schemas.chat import ChatSessionCreate, ChatSessionUpdate
+from app.utils.cache import CachedCounter
+
+
+def _load_active_session_count() -> int:
+    """ 캐시 갱신용: DB에서 활성 세션 수를 직접 조회합니다. (실패 시 예외 전파) """
+    db = SessionLocal()
+    try:
+        return db.query(ChatSession).filter(ChatSession.is_active == True).count()
+    finally:
+        db.close()
+
+
+# 헬스 체크가 매번 COUNT(*)를 실행하지 않도록 주기적으로만 DB에서 다시 읽는 카운터
+active_session_counter = CachedCounter(_load_active_session_count, ttl=lambda: settings.ACTIVE_SESSION_COUNT_TTL)
 
 
 class ChatSessionCRUD:
@@ -17,6 +34,7 @@ class ChatSessionCRUD:
             db.add(db_session)
             db.commit()
             db.refresh(db_session)
+            active_session_counter.adjust(1)
             return db_session
         except SQLAlchemyError as e:
             db.rollback()
@@ -41,6 +59,36 @@ class ChatSessionCRUD:
             print(f"Error getting recent chat sessions: {e}")
             return []
     
+    def get_recent_session_rows(self, db: Session, fields: List[str], message_fields: List[str],
+                                limit: int = 20) -> List[dict]:
+        """ 최근 활성 세션을 지정한 필드만 dict 로 조회합니다. 'messages' 를 요청한 경우에만 메시지를 한 번에 로딩합니다."""
+        try:
+            query_filter = ChatSession.is_active == True
+            order = ChatSession.updated_at.desc()
+            session_fields = [field for field in fields if field != "messages"]
+
+            if "messages" not in fields:
+                rows = db.query(*[getattr(ChatSession, field) for field in session_fields]).filter(
+                    query_filter
+                ).order_by(order).limit(limit).all()
+                return [dict(row._mapping) for row in rows]
+
+            sessions = db.query(ChatSession).options(selectinload(ChatSession.messages)).filter(
+                query_filter
+            ).order_by(order).limit(limit).all()
+            results = []
+            for chat_session in sessions:
+                row = {field: getattr(chat_session, field) for field in session_fields}
+                row["messages"] = [
+                    {field: getattr(message, field) for field in message_fields}
+                    for message in sorted(chat_session.messages, key=lambda m: m.id)
+                ]
+                results.append(row)
+            return results
+        except SQLAlchemyError as e:
+            print(f"Error getting recent chat session rows: {e}")
+            return []
+    
     def update_session(self, db: Session, session_id: int, session_data: ChatSessionUpdate) -> Optional[ChatSession]:
         """ 채팅 세션의 제목이나 활성 상태를 업데이트합니다. """
         try:
@@ -48,6 +96,8 @@ class ChatSessionCRUD:
             if not db_session:
                 return None
             
+            was_active = bool(db_session.is_active)
+            
             # Update fields if provided
             if session_data.title is not None:
                 db_session.title = session_data.title
@@ -56,6 +106,8 @@ class ChatSessionCRUD:
                 
             db.commit()
             db.refresh(db_session)
+            if bool(db_session.is_active) != was_active:
+                active_session_counter.adjust(1 if db_session.is_active else -1)
             return db_session
         except SQLAlchemyError as e:
             db.rollback()
@@ -69,15 +121,55 @@ class ChatSessionCRUD:
             if not db_session:
                 return False
             
+            was_active = bool(db_session.is_active)
+            
             # Soft delete by setting is_active to False
             db_session.is_active = False
             db.commit()
+            if was_active:
+                active_session_counter.adjust(-1)
             return True
         except SQLAlchemyError as e:
             db.rollback()
             print(f"Error deleting chat session: {e}")
             return False
     
+    def bulk_delete_sessions(self, db: Session, session_ids: List[int]) -> int:
+        """ 여러 채팅 세션을 하나의 UPDATE 문으로 소프트 삭제합니다. 삭제된 세션 수를 반환합니다."""
+        try:
+            result = db.execute(
+                update(ChatSession)
+                .where(ChatSession.id.in_(session_ids), ChatSession.is_active == True)
+                .values(is_active=False)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            active_session_counter.adjust(-result.rowcount)
+            return result.rowcount
+        except SQLAlchemyError as e:
+            db.rollback()
+            print(f"Error bulk deleting chat sessions: {e}")
+            return 0
+    
+    def bulk_update_titles(self, db: Session, titles: Dict[int, str]) -> int:
+        """ 여러 채팅 세션의 제목을 executemany 한 번으로 변경합니다. 대상 세션 수를 반환합니다."""
+        try:
+            existing_ids = {
+                row.id for row in db.query(ChatSession.id).filter(ChatSession.id.in_(list(titles)))
+            }
+            if not existing_ids:
+                return 0
+            db.execute(
+                update(ChatSession),
+                [{"id": session_id, "title": titles[session_id]} for session_id in existing_ids]
+            )
+            db.commit()
+            return len(existing_ids)
+        except SQLAlchemyError as e:
+            db.rollback()
+            print(f"Error bulk updating chat session titles: {e}")
+            return 0
+    
     def get_active_session_count(self, db: Session) -> int:
         """ 활성화된 채팅 세션의 수를 조회합니다."""
         try:
@@ -85,6 +177,10 @@ class ChatSessionCRUD:
         except SQLAlchemyError as e:
             print(f"Error getting active session count: {e}")
             return 0
+    
+    def get_cached_active_session_count(self) -> int:
+        """ 캐시된 활성 세션 수를 반환합니다. TTL이 지난 경우에만 DB를 조회합니다."""
+        return active_session_counter.get()
 
 
 chat_session_crud = ChatSessionCRUD()
@@ -0,0 +1,288 @@
+import datetime
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import orjson
+from sqlalchemy import select, insert, type_coerce
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.types import LargeBinary
+
+from app.models.chat import ChatSession, Message
+from app.models.types import get_content_codec
+from app.services.chat_session_crud import active_session_counter
+from app.services.search import search_service
+
+SESSION_EXPORT_FIELDS = ["id", "session_id", "title", "is_active", "created_at", "updated_at"]
+MESSAGE_EXPORT_FIELDS = [
+    "id", "message_id", "session_id", "role", "content",
+    "tokens_used", "processing_time", "status", "created_at", "updated_at",
+]
+DATETIME_FIELDS = ("created_at", "updated_at")
+# 최근에 본 세션만 기억 (메모리 사용량 상한). 밀려난 세션이 다시 나오면 세션 레코드를 한 번 더 내보냄
+SESSION_CACHE_SIZE = 10000
+
+
+def _parse_datetime(value: Any) -> Optional[datetime.datetime]:
+    if value is None or isinstance(value, datetime.datetime):
+        return value
+    return datetime.datetime.fromisoformat(value)
+
+
+class RecentCache(OrderedDict):
+    """ 최대 max_size 개까지만 유지하는 LRU dict """
+
+    def __init__(self, max_size: int = SESSION_CACHE_SIZE):
+        super().__init__()
+        self.max_size = max_size
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        self.move_to_end(key)
+        return self[key]
+
+    def put(self, key, value) -> None:
+        self[key] = value
+        self.move_to_end(key)
+        if len(self) > self.max_size:
+            self.popitem(last=False)
+
+    def add(self, key) -> bool:
+        """ 처음 보거나 캐시에서 밀려난 키면 True """
+        if key in self:
+            self.move_to_end(key)
+            return False
+        self.put(key, None)
+        return True
+
+
+class ExportService:
+    """
+    대화 데이터를 스트리밍으로 내보내고 다시 가져옵니다.
+
+    레코드 형식 (NDJSON 한 줄 = 레코드 하나, 메시지 id 순):
+      {"type": "session", ...}     세션이 처음 등장할 때 (오래전에 나온 세션은 다시 나올 수 있음)
+      {"type": "message", ..., "session_uuid": ...}
+          blob 파일이 없어 본문을 읽지 못한 메시지는 content 가 null 이고 "content_missing": true
+      {"type": "checkpoint", "last_message_id": N, "messages": count}  마지막 줄
+    다음 증분 내보내기는 last_message_id 를 since_id 로 넘기면 됩니다.
+    """
+
+    def _iter_rows(self, db: Session, since_id: Optional[int] = None,
+                   start: Optional[datetime.datetime] = None, end: Optional[datetime.datetime] = None,
+                   yield_per: int = 1000) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """ 서버 사이드 커서로 메시지를 id 순으로 읽어 (세션, 메시지) 컬럼 dict 를 생성합니다. """
+        codec = get_content_codec()
+        # 본문은 저장 포맷 그대로 읽어 직접 복원 (blob 누락을 대체 문자열과 구분하기 위해)
+        columns = [
+            type_coerce(Message.content, LargeBinary).label("content") if field == "content"
+            else getattr(Message, field)
+            for field in MESSAGE_EXPORT_FIELDS
+        ]
+        session_columns = [getattr(ChatSession, field).label(f"s_{field}") for field in SESSION_EXPORT_FIELDS]
+        stmt = (
+            select(*columns, *session_columns)
+            .join(ChatSession, ChatSession.id == Message.session_id)
+            .order_by(Message.id)
+            .execution_options(yield_per=yield_per)
+        )
+        if since_id is not None:
+            stmt = stmt.where(Message.id > since_id)
+        if start is not None:
+            stmt = stmt.where(Message.created_at >= start)
+        if end is not None:
+            stmt = stmt.where(Message.created_at < end)
+
+        for row in db.execute(stmt):
+            mapping = row._mapping
+            message = {field: mapping[field] for field in MESSAGE_EXPORT_FIELDS}
+            if message["content"] is not None:
+                message["content"] = codec.decode(bytes(message["content"]), missing=None)
+                if message["content"] is None:
+                    message["content_missing"] = True
+            yield (
+                {field: mapping[f"s_{field}"] for field in SESSION_EXPORT_FIELDS},
+                message,
+            )
+
+    def iter_records(self, db: Session, since_id: Optional[int] = None, **filters) -> Iterator[Dict[str, Any]]:
+        """ 세션/메시지/체크포인트 레코드를 생성합니다. (메모리 사용량 일정) """
+        seen_sessions = RecentCache()
+        last_message_id = since_id
+        count = 0
+        for session, message in self._iter_rows(db, since_id=since_id, **filters):
+            if seen_sessions.add(session["id"]):
+                yield dict(session, type="session")
+            yield dict(message, type="message", session_uuid=session["session_id"])
+            last_message_id = message["id"]
+            count += 1
+        yield {"type": "checkpoint", "last_message_id": last_message_id, "messages": count}
+
+    def iter_ndjson(self, db: Session, **filters) -> Iterator[bytes]:
+        """ 레코드를 NDJSON 바이트 줄로 변환합니다. """
+        for record in self.iter_records(db, **filters):
+            yield orjson.dumps(record) + b"\n"
+
+    def write_parquet(self, db: Session, sink, batch_size: int = 5000, **filters) -> Dict[str, Any]:
+        """
+        메시지 한 행에 세션 컬럼(session_*)을 붙인 평면 테이블을 Parquet 로 기록합니다.
+        batch_size 행 단위로 row group 을 기록하므로 메모리 사용량이 일정합니다.
+        체크포인트 레코드를 반환합니다.
+        """
+        import pyarrow as pa  # 선택 의존성: Parquet 내보내기/가져오기에만 필요
+        import pyarrow.parquet as pq
+
+        schema = pa.schema(
+            [
+                ("id", pa.int64()), ("message_id", pa.string()), ("session_id", pa.int64()),
+                ("role", pa.string()), ("content", pa.large_string()), ("tokens_used", pa.int64()),
+                ("processing_time", pa.int64()), ("status", pa.string()),
+                ("created_at", pa.timestamp("us")), ("updated_at", pa.timestamp("us")),
+                ("content_missing", pa.bool_()),
+                ("session_uuid", pa.string()), ("session_title", pa.string()), ("session_is_active", pa.bool_()),
+                ("session_created_at", pa.timestamp("us")), ("session_updated_at", pa.timestamp("us")),
+            ]
+        )
+        last_message_id = filters.get("since_id")
+        count = 0
+        batch: List[Dict[str, Any]] = []
+        with pq.ParquetWriter(sink, schema) as writer:
+            # 행마다 세션 컬럼을 함께 읽으므로 세션 정보를 따로 보관하지 않음
+            for session, message in self._iter_rows(db, **filters):
+                message.update({
+                    "session_uuid": session["session_id"],
+                    "session_title": session["title"],
+                    "session_is_active": session["is_active"],
+                    "session_created_at": session["created_at"],
+                    "session_updated_at": session["updated_at"],
+                })
+                batch.append(message)
+                last_message_id = message["id"]
+                count += 1
+                if len(batch) >= batch_size:
+                    writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                    batch = []
+            if batch:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+        return {"type": "checkpoint", "last_message_id": last_message_id, "messages": count}
+
+    @staticmethod
+    def iter_parquet_records(source, batch_size: int = 5000) -> Iterator[Dict[str, Any]]:
+        """ write_parquet 으로 만든 파일을 세션/메시지 레코드로 다시 풉니다. """
+        import pyarrow.parquet as pq
+
+        seen_sessions = RecentCache()
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=batch_size):
+            for row in batch.to_pylist():
+                session = {
+                    "type": "session",
+                    "id": row["session_id"],
+                    "session_id": row["session_uuid"],
+                    "title": row.pop("session_title"),
+                    "is_active": row.pop("session_is_active"),
+                    "created_at": row.pop("session_created_at"),
+                    "updated_at": row.pop("session_updated_at"),
+                }
+                if seen_sessions.add(row["session_id"]):
+                    yield session
+                yield dict(row, type="message")
+
+    @staticmethod
+    def iter_ndjson_records(lines: Iterable[bytes]) -> Iterator[Dict[str, Any]]:
+        for line in lines:
+            if line.strip():
+                yield orjson.loads(line)
+
+    def import_records(self, db: Session, records: Iterable[Dict[str, Any]], batch_size: int = 1000) -> Dict[str, int]:
+        """
+        내보낸 레코드를 가져옵니다. 메시지는 batch_size 단위 다중 행 INSERT 로 저장합니다.
+        세션은 session_id(UUID), 메시지는 message_id(UUID) 기준으로 이미 있으면 건너뛰므로 재실행해도 안전합니다.
+        세션 레코드 없이 나온 메시지는 session_uuid 로 기존 세션을 찾고, 없으면 건너뛰고 orphan_messages 로 셉니다.
+        본문이 누락된(content_missing) 메시지는 저장하지 않고 missing_content_messages 로 셉니다.
+        """
+        session_map = RecentCache()  # 내보낸 파일의 세션 id → 이 DB 의 세션 id
+        stats = {
+            "sessions": 0, "messages": 0, "skipped_messages": 0, "orphan_messages": 0, "missing_content_messages": 0,
+        }
+        pending: List[Dict[str, Any]] = []
+
+        def flush() -> None:
+            if not pending:
+                return
+            existing = set(db.execute(
+                select(Message.message_id).where(Message.message_id.in_([row["message_id"] for row in pending]))
+            ).scalars())
+            rows = [row for row in pending if row["message_id"] not in existing]
+            stats["skipped_messages"] += len(pending) - len(rows)
+            if rows:
+                db.execute(insert(Message), rows)
+                # 검색 색인용 원문도 같은 트랜잭션에서 일괄 저장
+                inserted = db.execute(
+                    select(Message.id, Message.message_id).where(
+                        Message.message_id.in_([row["message_id"] for row in rows])
+                    )
+                ).all()
+                ids = {message_uuid: message_id for message_id, message_uuid in inserted}
+                search_service.index_messages_bulk(db, [
+                    {"message_id": ids[row["message_id"]], "session_id": row["session_id"], "content": row["content"]}
+                    for row in rows if row["content"]
+                ])
+            db.commit()
+            stats["messages"] += len(rows)
+            pending.clear()
+
+        try:
+            for record in records:
+                record_type = record.get("type")
+                if record_type == "session":
+                    session_map.put(record["id"], self._import_session(db, record, stats))
+                elif record_type == "message":
+                    if record.get("content_missing"):
+                        stats["missing_content_messages"] += 1
+                        continue
+                    session_id = session_map.get(record["session_id"])
+                    if session_id is None:
+                        session_id = self._find_session(db, record.get("session_uuid"))
+                        if session_id is None:
+                            stats["orphan_messages"] += 1
+                            continue
+                        session_map.put(record["session_id"], session_id)
+                    row = {field: record.get(field) for field in MESSAGE_EXPORT_FIELDS if field != "id"}
+                    row["session_id"] = session_id
+                    for field in DATETIME_FIELDS:
+                        row[field] = _parse_datetime(row[field])
+                    pending.append(row)
+                    if len(pending) >= batch_size:
+                        flush()
+            flush()
+        except SQLAlchemyError as e:
+            db.rollback()
+            print(f"Error importing records: {e}")
+        if stats["sessions"]:
+            # 활성 세션 수 캐시는 다음 조회 때 다시 계산
+            active_session_counter.invalidate()
+        return stats
+
+    @staticmethod
+    def _find_session(db: Session, session_uuid: Optional[str]) -> Optional[int]:
+        if not session_uuid:
+            return None
+        return db.execute(select(ChatSession.id).where(ChatSession.session_id == session_uuid)).scalar()
+
+    def _import_session(self, db: Session, record: Dict[str, Any], stats: Dict[str, int]) -> int:
+        existing_id = self._find_session(db, record["session_id"])
+        if existing_id is not None:
+            return existing_id
+        result = db.execute(insert(ChatSession).values(
+            session_id=record["session_id"],
+            title=record.get("title"),
+            is_active=record.get("is_active", True),
+            created_at=_parse_datetime(record.get("created_at")),
+            updated_at=_parse_datetime(record.get("updated_at")),
+        ))
+        stats["sessions"] += 1
+        return result.inserted_primary_key[0]
+
+
+export_service = ExportService()
@@ -1,14 +1,21 @@
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.models.chat import Message, ChatSession
 from app.schemas.chat import MessageCreate
+from app.services.search import search_service
+from app.services.metrics import metrics_service
 
 
 class MessageCRUD:
-    def create_message(self, db: Session, message_data: MessageCreate, session_id: int) -> Optional[Message]:
-        """ 채팅 세션에 새로운 메시지를 추가합니다. """
+    def create_message(self, db: Session, message_data: MessageCreate, session_id: int,
+                       tokens_used: Optional[int] = None, processing_time: Optional[int] = None,
+                       status: str = "complete", performance: Optional[Dict[str, Any]] = None) -> Optional[Message]:
+        """
+        채팅 세션에 새로운 메시지를 추가합니다.
+        performance 를 넘기면 턴 성능 기록(TurnMetric)을 같은 트랜잭션에 저장합니다.
+        """
         try:
             # Verify that the session exists
             session = db.query(ChatSession).filter(ChatSession.id == session_id).first()
@@ -19,9 +26,18 @@ class MessageCRUD:
             db_message = Message(
                 session_id=session_id,
                 role=message_data.role,
-                content=message_data.content
+                content=message_data.content,
+                tokens_used=tokens_used,
+                processing_time=processing_time,
+                status=status
             )
             db.add(db_message)
+            if message_data.content or performance:
+                db.flush()
+            if message_data.content:
+                search_service.index_message(db, db_message.id, session_id, message_data.content)
+            if performance:
+                metrics_service.record_turn(db, db_message.id, session_id, **performance)
             db.commit()
             db.refresh(db_message)
             return db_message
@@ -40,6 +56,19 @@ class MessageCRUD:
             print(f"Error getting messages by session: {e}")
             return []
     
+    def get_message_rows(self, db: Session, session_id: int, fields: List[str],
+                         skip: int = 0, limit: int = 100) -> List[dict]:
+        """ 지정한 필드만 조회하여 dict 목록으로 반환합니다. (content 를 빼면 본문을 읽지 않음) """
+        try:
+            columns = [getattr(Message, field) for field in fields]
+            rows = db.query(*columns).filter(
+                Message.session_id == session_id
+            ).order_by(Message.created_at).offset(skip).limit(limit).all()
+            return [dict(row._mapping) for row in rows]
+        except SQLAlchemyError as e:
+            print(f"Error getting message rows by session: {e}")
+            return []
+    
     def update_message_content(self, db: Session, message_id: int, content: str) -> Optional[Message]:
         """ 메시지 내용을 업데이트합니다. """
         try:
@@ -48,6 +77,7 @@ class MessageCRUD:
                 return None
             
             db_message.content = content
+            search_service.index_message(db, db_message.id, db_message.session_id, content)
             db.commit()
             db.refresh(db_message)
             return db_message
@@ -77,6 +107,22 @@ class MessageCRUD:
             print(f"Error updating message metadata: {e}")
             return None
     
+    def update_message_status(self, db: Session, message_id: int, status: str) -> Optional[Message]:
+        """ 메시지 상태를 업데이트합니다. ('complete', 'incomplete', 'failed') """
+        try:
+            db_message = db.query(Message).filter(Message.id == message_id).first()
+            if not db_message:
+                return None
+            
+            db_message.status = status
+            db.commit()
+            db.refresh(db_message)
+            return db_message
+        except SQLAlchemyError as e:
+            db.rollback()
+            print(f"Error updating message status: {e}")
+            return None
+    
     def get_conversation_history(self, db: Session, session_id: int, include_system: bool = True) -> List[Message]:
         """ 채팅 세션의 전체 대화 기록을 시간 순으로 조회합니다. """
         try:
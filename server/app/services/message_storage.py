@@ -0,0 +1,84 @@
+from typing import Set
+
+from sqlalchemy import select, update, type_coerce, func
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.types import LargeBinary
+
+from app.models.archive import MessageArchive
+from app.models.chat import Message
+from app.models.types import get_content_codec
+from app.utils.compression import MARKER, FORMAT_BLOB
+
+
+class MessageStorageService:
+    """ 기존 메시지 본문을 현재 저장 포맷(압축/blob)으로 변환하고 사용하지 않는 blob 을 정리합니다. """
+
+    def recompress_messages(self, db: Session, batch_size: int = 500) -> int:
+        """
+        아직 압축되지 않은 큰 메시지를 id 순으로 배치 처리하여 다시 저장합니다.
+        변환된 메시지 수를 반환합니다.
+        """
+        codec = get_content_codec()
+        raw_content = type_coerce(Message.content, LargeBinary)
+        last_id = 0
+        converted = 0
+        try:
+            while True:
+                rows = db.execute(
+                    select(Message.id, raw_content)
+                    .where(Message.id > last_id, func.length(raw_content) >= codec.min_bytes)
+                    .order_by(Message.id)
+                    .limit(batch_size)
+                ).all()
+                if not rows:
+                    break
+                last_id = rows[-1][0]
+
+                updates = [
+                    {"id": message_id, "content": codec.decode(bytes(data))}
+                    for message_id, data in rows
+                    if not codec.is_encoded(bytes(data))
+                ]
+                if updates:
+                    db.execute(update(Message), updates)
+                    db.commit()
+                    converted += len(updates)
+        except SQLAlchemyError as e:
+            db.rollback()
+            print(f"Error recompressing messages: {e}")
+        return converted
+
+    def _referenced_blob_keys(self, db: Session, batch_size: int) -> Set[str]:
+        """ messages / messages_archive 가 참조하는 blob 키 """
+        codec = get_content_codec()
+        keys = set()
+        for model in (Message, MessageArchive):
+            raw_content = type_coerce(model.content, LargeBinary)
+            stmt = (
+                select(raw_content)
+                .where(func.substr(raw_content, 1, 2) == MARKER + FORMAT_BLOB)
+                .execution_options(yield_per=batch_size)
+            )
+            for data in db.execute(stmt).scalars():
+                keys.add(codec.blob_key(bytes(data)))
+        return keys
+
+    def collect_blob_garbage(self, db: Session, min_age_seconds: float = 3600,
+                             dry_run: bool = False, batch_size: int = 1000) -> int:
+        """
+        어떤 메시지도 참조하지 않는 blob 파일을 삭제합니다. (메시지 삭제/수정 후 남은 파일)
+        삭제한(dry_run 이면 삭제 대상) blob 수를 반환하며, DB 조회에 실패하면 아무것도 삭제하지 않습니다.
+        """
+        codec = get_content_codec()
+        if codec.blob_store is None:
+            return 0
+        try:
+            referenced = self._referenced_blob_keys(db, batch_size)
+        except SQLAlchemyError as e:
+            print(f"Error collecting referenced blobs: {e}")
+            return 0
+        return codec.blob_store.remove_unreferenced(referenced, min_age_seconds, dry_run=dry_run)
+
+
+message_storage_service = MessageStorageService()
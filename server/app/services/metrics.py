@@ -0,0 +1,279 @@
+import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, insert, delete, func
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.metrics import TurnMetric, TurnMetricRollup
+
+ROLLUP_SECONDS = 3600
+BUCKET_SECONDS = {"hour": 3600, "day": 86400}
+PERCENTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+
+
+def _latency_buckets(start: float = 10.0, factor: float = 1.2, limit: float = 600000.0) -> List[int]:
+    """ 10ms ~ 10분 구간을 20% 간격으로 나눈 히스토그램 상한값 목록 (백분위수 오차 최대 20%) """
+    edges = []
+    edge = start
+    while edge < limit:
+        edges.append(int(round(edge)))
+        edge *= factor
+    edges.append(int(limit))
+    return edges
+
+
+LATENCY_BUCKETS_MS = _latency_buckets()
+
+
+def floor_time(value: datetime.datetime, seconds: int) -> datetime.datetime:
+    """ 시각을 구간 시작(UTC 기준 시/일 경계)으로 내림합니다. """
+    if seconds >= 86400:
+        return value.replace(hour=0, minute=0, second=0, microsecond=0)
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+class LatencyHistogram:
+    """ LATENCY_BUCKETS_MS 구간별 개수. 마지막 칸은 상한 초과 값입니다. """
+
+    def __init__(self, counts: Optional[List[int]] = None):
+        self.counts = list(counts) if counts else [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def add(self, value_ms: int) -> None:
+        for index, edge in enumerate(LATENCY_BUCKETS_MS):
+            if value_ms <= edge:
+                self.counts[index] += 1
+                return
+        self.counts[-1] += 1
+
+    def merge(self, counts: List[int]) -> None:
+        for index, count in enumerate(counts):
+            self.counts[index] += count
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """ 구간 안에서는 선형 보간한 백분위수 근사값을 반환합니다. """
+        total = self.total
+        if not total:
+            return None
+        rank = q * total
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if count and cumulative + count >= rank:
+                if index >= len(LATENCY_BUCKETS_MS):
+                    return float(LATENCY_BUCKETS_MS[-1])
+                lower = LATENCY_BUCKETS_MS[index - 1] if index else 0
+                upper = LATENCY_BUCKETS_MS[index]
+                return round(lower + (upper - lower) * (rank - cumulative) / count, 1)
+            cumulative += count
+        return float(LATENCY_BUCKETS_MS[-1])
+
+
+class TurnAggregate:
+    """ 턴 성능 기록(또는 롤업 행)을 합산합니다. """
+
+    def __init__(self):
+        self.turns = 0
+        self.failed_turns = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        # tokens/sec 는 첫 토큰을 받은 턴만으로 계산 (stream_ms 와 같은 턴 집합)
+        self.streamed_completion_tokens = 0
+        self.stream_ms = 0
+        self.ttft_sum_ms = 0
+        self.total_sum_ms = 0
+        self.ttft = LatencyHistogram()
+        self.total = LatencyHistogram()
+
+    def add_turn(self, row) -> None:
+        self.turns += 1
+        if row.outcome != "complete":
+            self.failed_turns += 1
+        self.prompt_tokens += row.prompt_tokens or 0
+        self.completion_tokens += row.completion_tokens or 0
+        self.total_sum_ms += row.total_ms
+        self.total.add(row.total_ms)
+        if row.ttft_ms is not None:
+            self.ttft_sum_ms += row.ttft_ms
+            self.ttft.add(row.ttft_ms)
+            self.stream_ms += max(row.total_ms - row.ttft_ms, 0)
+            self.streamed_completion_tokens += row.completion_tokens or 0
+
+    def add_rollup(self, rollup: TurnMetricRollup) -> None:
+        self.turns += rollup.turns
+        self.failed_turns += rollup.failed_turns
+        self.prompt_tokens += rollup.prompt_tokens
+        self.completion_tokens += rollup.completion_tokens
+        self.streamed_completion_tokens += rollup.streamed_completion_tokens
+        self.stream_ms += rollup.stream_ms
+        self.ttft_sum_ms += rollup.ttft_sum_ms
+        self.total_sum_ms += rollup.total_sum_ms
+        self.ttft.merge(rollup.ttft_histogram)
+        self.total.merge(rollup.total_histogram)
+
+    def to_rollup_values(self) -> Dict[str, Any]:
+        return {
+            "turns": self.turns,
+            "failed_turns": self.failed_turns,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "streamed_completion_tokens": self.streamed_completion_tokens,
+            "stream_ms": self.stream_ms,
+            "ttft_sum_ms": self.ttft_sum_ms,
+            "total_sum_ms": self.total_sum_ms,
+            "ttft_histogram": self.ttft.counts,
+            "total_histogram": self.total.counts,
+        }
+
+    @staticmethod
+    def _percentiles(histogram: LatencyHistogram, total_ms: int) -> Dict[str, Optional[float]]:
+        count = histogram.total
+        result = {"avg": round(total_ms / count, 1) if count else None}
+        result.update({name: histogram.percentile(q) for name, q in PERCENTILES.items()})
+        return result
+
+    def summary(self, bucket_seconds: int) -> Dict[str, Any]:
+        return {
+            "turns": self.turns,
+            "failed_turns": self.failed_turns,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "turns_per_minute": round(self.turns / (bucket_seconds / 60), 3),
+            "tokens_per_second": (
+                round(self.streamed_completion_tokens / (self.stream_ms / 1000), 2) if self.stream_ms else None
+            ),
+            "ttft_ms": self._percentiles(self.ttft, self.ttft_sum_ms),
+            "total_ms": self._percentiles(self.total, self.total_sum_ms),
+        }
+
+
+# 집계에 필요한 컬럼만 조회
+_TURN_COLUMNS = (
+    TurnMetric.created_at, TurnMetric.model, TurnMetric.outcome, TurnMetric.ttft_ms,
+    TurnMetric.total_ms, TurnMetric.prompt_tokens, TurnMetric.completion_tokens,
+)
+
+
+class MetricsService:
+    """ 턴 성능 기록과 모델 x 시간 구간별 지연 시간 분석을 담당합니다. """
+
+    def record_turn(self, db: Session, message_id: Optional[int], session_id: int, **values) -> TurnMetric:
+        """ 턴 성능 기록을 추가합니다. 호출자의 트랜잭션에 포함되며 커밋은 호출자가 수행합니다. """
+        metric = TurnMetric(message_id=message_id, session_id=session_id, **values)
+        db.add(metric)
+        return metric
+
+    def save_turn(self, db: Session, session_id: int, **values) -> Optional[TurnMetric]:
+        """ 메시지 없이 턴 성능 기록만 저장합니다. (스트림 시작 전에 실패한 턴) """
+        try:
+            metric = self.record_turn(db, None, session_id, **values)
+            db.commit()
+            return metric
+        except SQLAlchemyError as e:
+            db.rollback()
+            print(f"Error saving turn metric: {e}")
+            return None
+
+    def get_rolled_up_until(self, db: Session) -> Optional[datetime.datetime]:
+        """ 롤업이 끝난 시각 (마지막 롤업 구간의 끝) """
+        last_bucket = db.execute(select(func.max(TurnMetricRollup.bucket_start))).scalar()
+        if last_bucket is None:
+            return None
+        return last_bucket + datetime.timedelta(seconds=ROLLUP_SECONDS)
+
+    def _aggregate_turns(self, db: Session, start: Optional[datetime.datetime], end: datetime.datetime,
+                         bucket_seconds: int, model: Optional[str] = None,
+                         aggregates: Optional[Dict[Tuple[datetime.datetime, str], TurnAggregate]] = None):
+        """ turn_metrics 를 created_at 인덱스 범위로 읽어 (구간 시작, 모델)별로 합산합니다. """
+        aggregates = {} if aggregates is None else aggregates
+        stmt = select(*_TURN_COLUMNS).where(TurnMetric.created_at < end).execution_options(yield_per=1000)
+        if start is not None:
+            stmt = stmt.where(TurnMetric.created_at >= start)
+        if model is not None:
+            stmt = stmt.where(TurnMetric.model == model)
+        for row in db.execute(stmt):
+            key = (floor_time(row.created_at, bucket_seconds), row.model)
+            aggregates.setdefault(key, TurnAggregate()).add_turn(row)
+        return aggregates
+
+    def rollup(self, db: Session, since: Optional[datetime.datetime] = None,
+               until: Optional[datetime.datetime] = None) -> int:
+        """
+        끝난 1시간 구간들의 턴 성능을 turn_metric_rollups 로 집계합니다.
+        since 를 생략하면 마지막 롤업 이후부터 이어서 집계하고, 지정하면 그 시점부터 다시 집계합니다.
+        생성/갱신된 롤업 행 수를 반환합니다.
+        """
+        until = floor_time(until or datetime.datetime.utcnow(), ROLLUP_SECONDS)
+        try:
+            if since is None:
+                since = self.get_rolled_up_until(db)
+            else:
+                since = floor_time(since, ROLLUP_SECONDS)
+            if since is not None and since >= until:
+                return 0
+
+            aggregates = self._aggregate_turns(db, since, until, ROLLUP_SECONDS)
+
+            # 같은 구간을 다시 집계해도 결과가 같도록 기존 행을 교체
+            stmt = delete(TurnMetricRollup).where(TurnMetricRollup.bucket_start < until)
+            if since is not None:
+                stmt = stmt.where(TurnMetricRollup.bucket_start >= since)
+            db.execute(stmt)
+            if aggregates:
+                db.execute(insert(TurnMetricRollup), [
+                    dict(aggregate.to_rollup_values(), bucket_start=bucket_start, model=model)
+                    for (bucket_start, model), aggregate in aggregates.items()
+                ])
+            db.commit()
+            return len(aggregates)
+        except SQLAlchemyError as e:
+            db.rollback()
+            print(f"Error rolling up turn metrics: {e}")
+            return 0
+
+    def get_latency_summary(self, db: Session, start: datetime.datetime, end: datetime.datetime,
+                            bucket: str = "hour", model: Optional[str] = None) -> Dict[str, Any]:
+        """
+        모델 x 시간 구간별 지연 시간 백분위수와 처리량을 반환합니다.
+        롤업이 끝난 구간은 turn_metric_rollups 를, 그 이후(최근 구간)만 turn_metrics 를 읽습니다.
+        """
+        bucket_seconds = BUCKET_SECONDS[bucket]
+        start = floor_time(start, ROLLUP_SECONDS)
+        aggregates: Dict[Tuple[datetime.datetime, str], TurnAggregate] = {}
+        rolled_up_until = None
+        try:
+            rolled_up_until = self.get_rolled_up_until(db)
+            live_start = start
+            if rolled_up_until is not None and rolled_up_until > start:
+                stmt = select(TurnMetricRollup).where(
+                    TurnMetricRollup.bucket_start >= start,
+                    TurnMetricRollup.bucket_start < min(end, rolled_up_until)
+                )
+                if model is not None:
+                    stmt = stmt.where(TurnMetricRollup.model == model)
+                for rollup in db.execute(stmt).scalars():
+                    key = (floor_time(rollup.bucket_start, bucket_seconds), rollup.model)
+                    aggregates.setdefault(key, TurnAggregate()).add_rollup(rollup)
+                live_start = rolled_up_until
+            if live_start < end:
+                self._aggregate_turns(db, live_start, end, bucket_seconds, model, aggregates)
+        except SQLAlchemyError as e:
+            print(f"Error getting latency summary: {e}")
+
+        items = [
+            dict(aggregate.summary(bucket_seconds), bucket_start=bucket_start, model=model_name)
+            for (bucket_start, model_name), aggregate in sorted(aggregates.items())
+        ]
+        return {
+            "start": start,
+            "end": end,
+            "bucket": bucket,
+            "rolled_up_until": rolled_up_until,
+            "items": items,
+        }
+
+
+metrics_service = MetricsService()
@@ -0,0 +1,297 @@
+import hashlib
+import math
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+# 토큰 예산 집계용 슬롯 수 (윈도우를 이 개수로 나눠 롤링 합산)
+BUDGET_SLOTS = 60
+
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local data = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(data[1]) or burst
+local ts = tonumber(data[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local retry = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    retry = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(retry)
+"""
+
+
+class RateLimitBackend:
+    """ 레이트 리밋 상태 저장소 인터페이스 """
+    # 네트워크 I/O 가 있는 백엔드는 이벤트 루프 밖(스레드풀)에서 호출
+    blocking = False
+
+    def take(self, key: str, rate: float, burst: int, now: float) -> float:
+        """ 토큰 버킷에서 1개를 가져옵니다. 허용되면 0, 아니면 재시도까지 남은 초를 반환합니다. """
+        raise NotImplementedError
+
+    def incr(self, key: str, slot: int, amount: int, ttl: int) -> None:
+        """ 슬롯 카운터를 증가시킵니다. """
+        raise NotImplementedError
+
+    def get_slots(self, key: str, slots: List[int]) -> List[int]:
+        """ 슬롯 카운터 값을 조회합니다. """
+        raise NotImplementedError
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """
+    프로세스 메모리 백엔드 (단일 워커용).
+    키 수는 max_keys 로 제한되며 넘치면 만료된 키를, 그래도 넘치면 가장 오래 사용하지 않은 키를 제거합니다.
+    """
+
+    def __init__(self, max_keys: int = 10000):
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._counters: Dict[str, Dict[int, int]] = {}
+        # 최근 사용 순서(LRU)를 유지하는 키별 만료 시각
+        self._expires: "OrderedDict[str, float]" = OrderedDict()
+        self._max_keys = max_keys
+
+    def _touch(self, key: str, expires_at: float) -> None:
+        self._expires[key] = expires_at
+        self._expires.move_to_end(key)
+
+    def _drop(self, key: str) -> None:
+        self._buckets.pop(key, None)
+        self._counters.pop(key, None)
+        self._expires.pop(key, None)
+
+    def _prune(self, now: float) -> None:
+        if len(self._expires) <= self._max_keys:
+            return
+        for key in [k for k, expires_at in self._expires.items() if expires_at < now]:
+            self._drop(key)
+        while len(self._expires) > self._max_keys:
+            self._drop(next(iter(self._expires)))
+
+    def take(self, key: str, rate: float, burst: int, now: float) -> float:
+        with self._lock:
+            tokens, ts = self._buckets.get(key, (float(burst), now))
+            tokens = min(burst, tokens + max(0.0, now - ts) * rate)
+            retry_after = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                retry_after = (1 - tokens) / rate
+            self._buckets[key] = (tokens, now)
+            self._touch(key, now + burst / rate + 1)
+            self._prune(now)
+            return retry_after
+
+    def incr(self, key: str, slot: int, amount: int, ttl: int) -> None:
+        with self._lock:
+            counters = self._counters.setdefault(key, {})
+            counters[slot] = counters.get(slot, 0) + amount
+            # 윈도우를 벗어난 슬롯 정리
+            oldest = slot - BUDGET_SLOTS
+            for old_slot in [s for s in counters if s <= oldest]:
+                del counters[old_slot]
+            now = time.time()
+            self._touch(key, now + ttl)
+            self._prune(now)
+
+    def get_slots(self, key: str, slots: List[int]) -> List[int]:
+        with self._lock:
+            counters = self._counters.get(key, {})
+            return [counters.get(slot, 0) for slot in slots]
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """
+    Redis 공유 백엔드 (다중 워커/파드용).
+    redis-py 호환 클라이언트를 받으므로 테스트에서는 fakeredis 등으로 대체할 수 있습니다.
+    """
+    blocking = True
+
+    def __init__(self, client, prefix: str = "rl"):
+        self.client = client
+        self.prefix = prefix
+        self._token_bucket = client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisRateLimitBackend":
+        import redis  # 선택 의존성: RATE_LIMIT_BACKEND=redis 일 때만 필요
+
+        return cls(redis.Redis.from_url(url))
+
+    def take(self, key: str, rate: float, burst: int, now: float) -> float:
+        retry_after = self._token_bucket(keys=[f"{self.prefix}:bucket:{key}"], args=[rate, burst, now])
+        return float(retry_after)
+
+    def incr(self, key: str, slot: int, amount: int, ttl: int) -> None:
+        slot_key = f"{self.prefix}:count:{key}:{slot}"
+        pipe = self.client.pipeline()
+        pipe.incrby(slot_key, amount)
+        pipe.expire(slot_key, ttl)
+        pipe.execute()
+
+    def get_slots(self, key: str, slots: List[int]) -> List[int]:
+        values = self.client.mget([f"{self.prefix}:count:{key}:{slot}" for slot in slots])
+        return [int(value) if value is not None else 0 for value in values]
+
+
+@dataclass
+class RateLimitUsage:
+    """ 키별 사용량 """
+    key: str
+    requests: int
+    tokens_used: int
+    token_budget: int
+    tokens_remaining: Optional[int]
+    window_seconds: int
+
+
+class RateLimiter:
+    """
+    키(API 키/IP/세션)별 요청 속도(토큰 버킷)와 롤링 토큰 예산을 적용합니다.
+    """
+
+    def __init__(self, backend: Optional[RateLimitBackend] = None):
+        self._backend = backend
+
+    @property
+    def backend(self) -> RateLimitBackend:
+        if self._backend is None:
+            if settings.RATE_LIMIT_BACKEND == "redis":
+                self._backend = RedisRateLimitBackend.from_url(settings.RATE_LIMIT_REDIS_URL)
+            else:
+                self._backend = MemoryRateLimitBackend()
+        return self._backend
+
+    @staticmethod
+    def _slot_seconds() -> float:
+        return settings.RATE_LIMIT_TOKEN_WINDOW_SECONDS / BUDGET_SLOTS
+
+    def _window_slots(self, now: float) -> List[int]:
+        current = int(now // self._slot_seconds())
+        return list(range(current - BUDGET_SLOTS + 1, current + 1))
+
+    def _record(self, key: str, metric: str, amount: int, now: float) -> None:
+        slot = int(now // self._slot_seconds())
+        ttl = settings.RATE_LIMIT_TOKEN_WINDOW_SECONDS + math.ceil(self._slot_seconds())
+        self.backend.incr(f"{metric}:{key}", slot, amount, ttl)
+
+    def _window(self, key: str, metric: str, now: float) -> List[Tuple[int, int]]:
+        slots = self._window_slots(now)
+        return list(zip(slots, self.backend.get_slots(f"{metric}:{key}", slots)))
+
+    def check(self, key: str, now: Optional[float] = None) -> None:
+        """ 요청을 허용할지 확인합니다. 초과 시 Retry-After 헤더와 함께 429를 발생시킵니다. """
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        now = time.time() if now is None else now
+
+        # 롤링 토큰 예산 확인 (가장 오래된 사용분이 윈도우를 벗어날 때까지 대기)
+        if settings.RATE_LIMIT_TOKEN_BUDGET > 0:
+            window = self._window(key, "tokens", now)
+            used = sum(amount for _, amount in window)
+            if used >= settings.RATE_LIMIT_TOKEN_BUDGET:
+                oldest_slot = next(slot for slot, amount in window if amount > 0)
+                expires_at = (oldest_slot + BUDGET_SLOTS) * self._slot_seconds()
+                self._reject("Token budget exceeded", expires_at - now)
+
+        rate = settings.RATE_LIMIT_REQUESTS_PER_MINUTE / 60.0
+        retry_after = self.backend.take(f"requests:{key}", rate, settings.RATE_LIMIT_BURST, now)
+        if retry_after > 0:
+            self._reject("Rate limit exceeded", retry_after)
+        self._record(key, "requests", 1, now)
+
+    async def acheck(self, *keys: str) -> None:
+        """
+        async 엔드포인트용 check(). 여러 키를 넘기면 모두 확인합니다.
+        공유 백엔드 호출은 스레드풀에서 실행해 이벤트 루프를 막지 않습니다.
+        """
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        for key in keys:
+            if self.backend.blocking:
+                await run_in_threadpool(self.check, key)
+            else:
+                self.check(key)
+
+    @staticmethod
+    def _reject(detail: str, retry_after: float) -> None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=detail,
+            headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+        )
+
+    def record_tokens(self, key: str, tokens: int, now: Optional[float] = None) -> None:
+        """ 실제 사용한 토큰 수를 예산에 반영합니다. """
+        if not settings.RATE_LIMIT_ENABLED or tokens <= 0:
+            return
+        try:
+            self._record(key, "tokens", tokens, time.time() if now is None else now)
+        except Exception as e:
+            print(f"Error recording token usage: {e}")
+
+    def get_usage(self, key: str, now: Optional[float] = None) -> RateLimitUsage:
+        """ 롤링 윈도우 동안의 키별 요청 수와 토큰 사용량을 반환합니다. """
+        now = time.time() if now is None else now
+        tokens_used = sum(amount for _, amount in self._window(key, "tokens", now))
+        budget = settings.RATE_LIMIT_TOKEN_BUDGET
+        return RateLimitUsage(
+            key=key,
+            requests=sum(amount for _, amount in self._window(key, "requests", now)),
+            tokens_used=tokens_used,
+            token_budget=budget,
+            tokens_remaining=max(0, budget - tokens_used) if budget > 0 else None,
+            window_seconds=settings.RATE_LIMIT_TOKEN_WINDOW_SECONDS,
+        )
+
+
+def hash_api_key(api_key: str) -> str:
+    """ RATE_LIMIT_API_KEY_HASHES 에 등록할 API 키 해시 (sha256 hex) """
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+
+def resolve_rate_limit_key(request: Request) -> str:
+    """
+    호출자 식별 키를 만듭니다.
+    api_key 전략에서는 RATE_LIMIT_API_KEY_HASHES 에 등록된 키만 인정하고, 없거나 등록되지 않은 키는 IP로 대체합니다.
+    (임의의 헤더 값을 바꿔 가며 보내 새 버킷/예산을 받는 것을 방지)
+    """
+    if settings.RATE_LIMIT_KEY_STRATEGY == "api_key":
+        api_key = request.headers.get(settings.RATE_LIMIT_API_KEY_HEADER)
+        if api_key:
+            key_hash = hash_api_key(api_key)
+            if key_hash in settings.RATE_LIMIT_API_KEY_HASHES:
+                # 키 원문이 저장소/응답에 남지 않도록 해시 사용
+                return f"key:{key_hash[:16]}"
+    client_host = request.client.host if request.client else "unknown"
+    return f"ip:{client_host}"
+
+
+def resolve_rate_limit_keys(request: Request, chat_id: Optional[int] = None) -> List[str]:
+    """
+    요청에 적용할 레이트 리밋 키 목록. 첫 번째는 항상 호출자 키입니다.
+    session 전략은 세션 키를 추가로 적용합니다. chat_id 는 클라이언트가 고르는 값이므로
+    세션을 바꿔 가며 보내도 호출자 키의 한도는 그대로 유지됩니다.
+    """
+    keys = [resolve_rate_limit_key(request)]
+    if settings.RATE_LIMIT_KEY_STRATEGY == "session" and chat_id is not None:
+        keys.append(f"session:{chat_id}")
+    return keys
+
+
+rate_limiter = RateLimiter()
@@ -0,0 +1,271 @@
+import html
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, List, Set, Tuple
+
+from sqlalchemy import select, insert, delete, func, and_
+from sqlalchemy.orm import Session
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.models.chat import ChatSession, Message
+from app.models.search import MessageSearch
+
+NGRAM_SIZE = 2  # MySQL ngram_token_size 기본값과 동일
+# message_search.content 는 MySQL MEDIUMTEXT(16MB) — utf8mb4 최악의 경우(4바이트/문자)에도 들어가도록 앞부분만 색인
+MAX_INDEXED_CHARS = (16 * 1024 * 1024 - 1) // 4
+# MySQL boolean 모드에서 연산자로 해석되는 문자
+BOOLEAN_OPERATORS = re.compile(r'[+\-<>()~*"@]')
+
+
+def split_terms(query: str) -> List[str]:
+    """ 검색어를 공백 기준 단어로 나눕니다. (소문자, 중복 제거) """
+    terms = []
+    for word in query.lower().split():
+        if word not in terms:
+            terms.append(word)
+    return terms
+
+
+def ngrams(word: str, n: int = NGRAM_SIZE) -> Set[str]:
+    if len(word) <= n:
+        return {word}
+    return {word[i:i + n] for i in range(len(word) - n + 1)}
+
+
+def highlight(text: str, terms: List[str], width: int) -> str:
+    """ 첫 번째 일치 위치 주변을 잘라 검색어를 <mark> 로 감싼 HTML 스니펫을 만듭니다. """
+    lower = text.lower()
+    positions = [pos for pos in (lower.find(term) for term in terms) if pos >= 0]
+    start = max(0, min(positions) - width // 3) if positions else 0
+    end = min(len(text), start + width)
+
+    fragment = html.escape(text[start:end])
+    if terms:
+        pattern = re.compile(
+            "|".join(re.escape(html.escape(term)) for term in sorted(terms, key=len, reverse=True)),
+            re.IGNORECASE
+        )
+        fragment = pattern.sub(lambda m: f"<mark>{m.group(0)}</mark>", fragment)
+    return ("…" if start > 0 else "") + fragment + ("…" if end < len(text) else "")
+
+
+class SearchBackend:
+    """ 검색 백엔드 인터페이스: 검색어를 message_search 에 대한 WHERE/ORDER BY 절로 변환합니다. """
+    name = ""
+
+    def on_indexed(self, message_id: int, content: str) -> None:
+        pass
+
+    def match_clause(self, db: Session, terms: List[str]):
+        raise NotImplementedError
+
+    def order_by(self, terms: List[str]) -> list:
+        return [Message.created_at.desc()]
+
+
+class MySQLFullTextBackend(SearchBackend):
+    """
+    MySQL FULLTEXT (ngram 파서) 인덱스를 사용하는 백엔드.
+    ngram 토큰보다 짧은 단어(예: "밥")는 FULLTEXT 로 부분 문자열을 찾을 수 없으므로
+    로컬 백엔드와 같은 결과가 나오도록 LIKE 로 거릅니다. (짧은 단어만 있으면 FULLTEXT 로 좁히지 못함)
+    """
+    name = "mysql"
+
+    @staticmethod
+    def _split_terms(terms: List[str]) -> Tuple[List[str], List[str]]:
+        """ (FULLTEXT 로 찾을 단어, LIKE 로 찾을 짧은 단어) """
+        long_terms, short_terms = [], []
+        for term in terms:
+            (short_terms if len(term) < NGRAM_SIZE else long_terms).append(term)
+        return long_terms, short_terms
+
+    @staticmethod
+    def _boolean_query(terms: List[str]) -> str:
+        # 모든 단어를 포함해야 하도록 +"단어" 형태로 변환
+        clauses = []
+        for term in terms:
+            term = BOOLEAN_OPERATORS.sub("", term)
+            if term:
+                clauses.append(f'+"{term}"')
+        return " ".join(clauses)
+
+    def match_clause(self, db: Session, terms: List[str]):
+        long_terms, short_terms = self._split_terms(terms)
+        clauses = [func.lower(MessageSearch.content).contains(term, autoescape=True) for term in short_terms]
+        query = self._boolean_query(long_terms)
+        if query:
+            clauses.insert(0, MessageSearch.content.match(query))
+        return and_(*clauses)
+
+    def order_by(self, terms: List[str]) -> list:
+        query = self._boolean_query(self._split_terms(terms)[0])
+        if not query:
+            return super().order_by(terms)
+        return [MessageSearch.content.match(query).desc(), Message.created_at.desc()]
+
+
+class LocalInvertedIndexBackend(SearchBackend):
+    """
+    프로세스 메모리 내 ngram 역색인 백엔드 (SQLite 테스트 환경용).
+    처음 검색할 때 message_search 테이블에서 색인을 만들고 이후 쓰기마다 증분 갱신합니다.
+    후보는 역색인으로 좁힌 뒤 SQL 부분 문자열 비교로 확정하므로 오래된 색인 항목은 결과에 영향을 주지 않습니다.
+    """
+    name = "local"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+        self._loaded = False
+
+    def _add(self, message_id: int, content: str) -> None:
+        for word in content.lower().split():
+            for gram in ngrams(word):
+                self._postings[gram].add(message_id)
+
+    def _ensure_loaded(self, db: Session) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if self._loaded:
+                return
+            for message_id, content in db.execute(select(MessageSearch.message_id, MessageSearch.content)):
+                self._add(message_id, content or "")
+            self._loaded = True
+
+    def on_indexed(self, message_id: int, content: str) -> None:
+        with self._lock:
+            if self._loaded:
+                self._add(message_id, content)
+
+    def _postings_for(self, gram: str) -> Set[int]:
+        if len(gram) >= NGRAM_SIZE:
+            return self._postings.get(gram, set())
+        # ngram 보다 짧은 검색어는 그 문자를 포함하는 모든 색인 키의 합집합
+        postings = set()
+        for key, message_ids in self._postings.items():
+            if gram in key:
+                postings |= message_ids
+        return postings
+
+    def candidates(self, db: Session, terms: List[str]) -> Set[int]:
+        self._ensure_loaded(db)
+        with self._lock:
+            result = None
+            for term in terms:
+                for gram in ngrams(term):
+                    postings = self._postings_for(gram)
+                    result = set(postings) if result is None else result & postings
+                    if not result:
+                        return set()
+            return result or set()
+
+    def match_clause(self, db: Session, terms: List[str]):
+        return and_(
+            MessageSearch.message_id.in_(self.candidates(db, terms)),
+            *[func.lower(MessageSearch.content).contains(term, autoescape=True) for term in terms]
+        )
+
+
+class SearchService:
+    """ 메시지 검색 색인 동기화와 검색을 담당합니다. """
+
+    def __init__(self):
+        self._backends = {
+            MySQLFullTextBackend.name: MySQLFullTextBackend(),
+            LocalInvertedIndexBackend.name: LocalInvertedIndexBackend(),
+        }
+
+    def get_backend(self, db: Session) -> SearchBackend:
+        name = settings.SEARCH_BACKEND
+        if name == "auto":
+            name = "mysql" if db.get_bind().dialect.name == "mysql" else "local"
+        return self._backends[name]
+
+    def index_message(self, db: Session, message_id: int, session_id: int, content: str) -> None:
+        """ 검색 색인을 갱신합니다. 호출자의 트랜잭션에 포함되며 커밋은 호출자가 수행합니다. """
+        content = content[:MAX_INDEXED_CHARS]
+        db.merge(MessageSearch(message_id=message_id, session_id=session_id, content=content))
+        self.get_backend(db).on_indexed(message_id, content)
+
+    def index_messages_bulk(self, db: Session, rows: List[dict]) -> None:
+        """
+        새로 추가된 메시지들을 다중 행 INSERT 한 번으로 색인합니다. (가져오기용, 커밋은 호출자가 수행)
+        rows: {"message_id", "session_id", "content"} 목록
+        """
+        if not rows:
+            return
+        rows = [dict(row, content=row["content"][:MAX_INDEXED_CHARS]) for row in rows]
+        db.execute(insert(MessageSearch), rows)
+        backend = self.get_backend(db)
+        for row in rows:
+            backend.on_indexed(row["message_id"], row["content"])
+
+    def remove_sessions(self, db: Session, session_ids: List[int]) -> None:
+        """ 세션에 속한 메시지를 검색 색인에서 제거합니다. (커밋은 호출자가 수행) """
+        db.execute(delete(MessageSearch).where(MessageSearch.session_id.in_(session_ids)))
+
+    def reindex(self, db: Session, batch_size: int = 500) -> int:
+        """ 모든 메시지로 검색 색인을 다시 채웁니다. 색인된 메시지 수를 반환합니다. """
+        last_id = 0
+        indexed = 0
+        try:
+            while True:
+                messages = db.execute(
+                    select(Message).where(Message.id > last_id).order_by(Message.id).limit(batch_size)
+                ).scalars().all()
+                if not messages:
+                    break
+                last_id = messages[-1].id
+                for message in messages:
+                    if message.content:
+                        self.index_message(db, message.id, message.session_id, message.content)
+                        indexed += 1
+                db.commit()
+                db.expunge_all()
+        except SQLAlchemyError as e:
+            db.rollback()
+            print(f"Error reindexing messages: {e}")
+        return indexed
+
+    def search(self, db: Session, query: str, skip: int = 0, limit: int = 20) -> Tuple[int, List[dict]]:
+        """ 활성 세션의 메시지를 검색합니다. (전체 개수, 하이라이트된 결과 목록)을 반환합니다. """
+        terms = split_terms(query)
+        if not terms:
+            return 0, []
+
+        backend = self.get_backend(db)
+        try:
+            base = (
+                select(
+                    Message.id, Message.session_id, Message.role, Message.created_at,
+                    ChatSession.title, MessageSearch.content
+                )
+                .select_from(MessageSearch)
+                .join(Message, Message.id == MessageSearch.message_id)
+                .join(ChatSession, ChatSession.id == Message.session_id)
+                .where(ChatSession.is_active == True, backend.match_clause(db, terms))
+            )
+            total = db.execute(select(func.count()).select_from(base.subquery())).scalar()
+            rows = db.execute(base.order_by(*backend.order_by(terms)).offset(skip).limit(limit)).all()
+        except SQLAlchemyError as e:
+            db.rollback()
+            print(f"Error searching messages: {e}")
+            return 0, []
+
+        items = [
+            {
+                "id": row.id,
+                "session_id": row.session_id,
+                "session_title": row.title,
+                "role": row.role,
+                "created_at": row.created_at,
+                "snippet": highlight(row.content or "", terms, settings.SEARCH_SNIPPET_CHARS),
+            }
+            for row in rows
+        ]
+        return total, items
+
+
+search_service = SearchService()
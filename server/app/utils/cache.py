@@ -0,0 +1,61 @@
+import threading
+import time
+from typing import Callable, Generic, Optional, TypeVar, Union
+
+T = TypeVar("T")
+
+
+class CachedValue(Generic[T]):
+    """
+    TTL 동안 loader 결과를 재사용하는 캐시.
+    만료된 뒤 처음 조회하는 스레드만 loader를 호출합니다.
+    ttl 에 함수를 넘기면 조회 시점에 값을 읽습니다. (설정값을 import 시점에 읽지 않기 위함)
+    """
+
+    def __init__(self, loader: Callable[[], T], ttl: Union[float, Callable[[], float]]):
+        self._loader = loader
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._value: Optional[T] = None
+        self._loaded_at: Optional[float] = None
+
+    @property
+    def loaded_at(self) -> Optional[float]:
+        return self._loaded_at
+
+    @property
+    def ttl(self) -> float:
+        return self._ttl() if callable(self._ttl) else self._ttl
+
+    def is_fresh(self) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    def get(self) -> T:
+        if self.is_fresh():
+            return self._value
+        with self._lock:
+            if not self.is_fresh():
+                self._value = self._loader()
+                self._loaded_at = time.monotonic()
+            return self._value
+
+    def set(self, value: T) -> None:
+        with self._lock:
+            self._value = value
+            self._loaded_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+
+
+class CachedCounter(CachedValue[int]):
+    """
+    주기적으로 원본에서 다시 읽고, 그 사이에는 adjust()로 증감만 반영하는 카운터
+    """
+
+    def adjust(self, delta: int) -> None:
+        with self._lock:
+            # 아직 한 번도 읽지 않았다면 다음 get()에서 원본을 읽으므로 무시
+            if self._loaded_at is not None:
+                self._value = max(0, self._value + delta)
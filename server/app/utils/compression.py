@@ -0,0 +1,167 @@
+import hashlib
+import os
+import time
+import zlib
+from typing import Iterator, Optional, Set
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성: 없으면 zlib 으로 대체
+    zstandard = None
+
+
+# 저장 포맷 마커. 0xFF 는 UTF-8 문자열에 나타날 수 없으므로
+# 마커가 없는 값은 압축되지 않은 (기존) 텍스트로 간주합니다.
+MARKER = b"\xff"
+FORMAT_ZLIB = b"z"
+FORMAT_ZSTD = b"s"
+FORMAT_BLOB = b"b"
+# blob 파일이 없을 때 본문 대신 반환하는 값 (조회 API 가 500 으로 실패하지 않도록)
+MISSING_BLOB_PLACEHOLDER = "[content unavailable: blob missing]"
+
+
+class LocalBlobStore:
+    """
+    대용량 메시지 본문을 파일시스템에 저장하는 콘텐츠 주소 기반 저장소.
+    키는 본문(압축 후)의 sha256 이며 같은 내용은 한 번만 저장됩니다.
+    root 는 모든 서버 인스턴스가 함께 마운트한 공유 볼륨이어야 합니다. (MESSAGE_BLOB_DIR 참고)
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+    def put(self, data: bytes) -> str:
+        key = hashlib.sha256(data).hexdigest()
+        path = self._path(key)
+        if os.path.exists(path):
+            # 같은 내용의 blob 을 다시 참조하는 경우에도 gc 가 커밋 전에 지우지 않도록 수정 시각 갱신
+            try:
+                os.utime(path)
+                return key
+            except FileNotFoundError:
+                pass  # 그 사이 gc 가 지웠으면 새로 기록
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return key
+
+    def get(self, key: str) -> bytes:
+        with open(self._path(key), "rb") as f:
+            return f.read()
+
+    def keys(self) -> Iterator[str]:
+        """ 저장된 모든 blob 키 (쓰기 중인 임시 파일 제외) """
+        if not os.path.isdir(self.root):
+            return
+        for prefix in os.listdir(self.root):
+            directory = os.path.join(self.root, prefix)
+            if not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                if not name.endswith(".tmp"):
+                    yield name
+
+    def remove_unreferenced(self, referenced: Set[str], min_age_seconds: float = 3600,
+                            dry_run: bool = False) -> int:
+        """
+        referenced 에 없는 blob 을 삭제하고 삭제한(dry_run 이면 삭제 대상) 개수를 반환합니다.
+        put 은 DB 커밋 전에 실행되므로 min_age_seconds 보다 최근에 만든 파일은 남겨 둡니다.
+        """
+        cutoff = time.time() - min_age_seconds
+        removed = 0
+        for key in list(self.keys()):
+            if key in referenced:
+                continue
+            path = self._path(key)
+            try:
+                if os.path.getmtime(path) > cutoff:
+                    continue
+                if not dry_run:
+                    os.remove(path)
+            except FileNotFoundError:
+                continue
+            removed += 1
+        return removed
+
+
+class ContentCodec:
+    """
+    메시지 본문을 DB 저장 포맷으로 변환합니다.
+
+    - min_bytes 미만: UTF-8 그대로 저장
+    - min_bytes 이상: MARKER + 포맷 + 압축 데이터
+    - blob_threshold_bytes 이상: 압축 데이터를 blob 저장소에 두고 MARKER + 'b' + 포맷 + 키만 저장
+    """
+
+    def __init__(self, algorithm: str = "zlib", min_bytes: int = 4096,
+                 blob_threshold_bytes: Optional[int] = None, blob_store: Optional[LocalBlobStore] = None,
+                 level: int = 6):
+        if algorithm == "zstd" and zstandard is None:
+            algorithm = "zlib"
+        self.algorithm = algorithm
+        self.min_bytes = min_bytes
+        self.blob_threshold_bytes = blob_threshold_bytes
+        self.blob_store = blob_store
+        self.level = level
+
+    def _compress(self, raw: bytes) -> bytes:
+        if self.algorithm == "zstd":
+            return FORMAT_ZSTD + zstandard.ZstdCompressor(level=self.level).compress(raw)
+        return FORMAT_ZLIB + zlib.compress(raw, self.level)
+
+    @staticmethod
+    def _decompress(data: bytes) -> bytes:
+        fmt, payload = data[:1], data[1:]
+        if fmt == FORMAT_ZLIB:
+            return zlib.decompress(payload)
+        if fmt == FORMAT_ZSTD:
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read zstd-compressed messages")
+            return zstandard.ZstdDecompressor().decompress(payload)
+        raise ValueError(f"Unknown message storage format: {fmt!r}")
+
+    def encode(self, text: str) -> bytes:
+        raw = text.encode("utf-8")
+        if self.algorithm == "none" or len(raw) < self.min_bytes:
+            return raw
+
+        compressed = self._compress(raw)
+        if self.blob_store is not None and self.blob_threshold_bytes and len(raw) >= self.blob_threshold_bytes:
+            key = self.blob_store.put(compressed)
+            return MARKER + FORMAT_BLOB + key.encode("ascii")
+        if len(compressed) + 1 >= len(raw):
+            # 압축 이득이 없으면 원문 저장
+            return raw
+        return MARKER + compressed
+
+    def decode(self, data: bytes, missing: Optional[str] = MISSING_BLOB_PLACEHOLDER) -> Optional[str]:
+        """ 저장 포맷을 원문으로 되돌립니다. blob 파일이 없으면 missing 을 반환합니다. """
+        if not data.startswith(MARKER):
+            return data.decode("utf-8")
+        body = data[1:]
+        if body[:1] == FORMAT_BLOB:
+            if self.blob_store is None:
+                raise RuntimeError("Message body is stored in the blob store but no blob store is configured")
+            key = body[1:].decode("ascii")
+            try:
+                body = self.blob_store.get(key)
+            except FileNotFoundError:
+                print(f"Message blob not found: {key}")
+                return missing
+        return self._decompress(body).decode("utf-8")
+
+    @staticmethod
+    def is_encoded(data: bytes) -> bool:
+        return data.startswith(MARKER)
+
+    @staticmethod
+    def blob_key(data: bytes) -> Optional[str]:
+        """ blob 저장소를 참조하는 값이면 그 키를, 아니면 None 을 반환합니다. """
+        if data.startswith(MARKER + FORMAT_BLOB):
+            return data[2:].decode("ascii")
+        return None
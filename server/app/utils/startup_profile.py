@@ -0,0 +1,66 @@
+"""
+서버 콜드 스타트 측정 도구
+
+새 인터프리터를 띄워 `-X importtime` 결과와 앱 import / lifespan 시작 / 첫 요청 시간을 측정합니다.
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Dict, List
+
+SERVER_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 별도 프로세스에서 실행되는 측정 스크립트
+_TIMING_SCRIPT = """
+import json, time
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app) as client:
+    started = time.perf_counter()
+    client.get("/api/v1/health/live")
+    first_request = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "startup_ms": (started - imported) * 1000,
+    "first_request_ms": (first_request - started) * 1000,
+}))
+"""
+
+
+@dataclass
+class ImportEntry:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def _run(args: List[str], env: Dict[str, str]) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args], cwd=SERVER_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def profile_imports(module: str = "app.main") -> List[ImportEntry]:
+    """ `python -X importtime -c "import <module>"` 결과를 파싱합니다. """
+    result = _run(["-X", "importtime", "-c", f"import {module}"], dict(os.environ))
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        entries.append(ImportEntry(name.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def measure_startup(runs: int = 3) -> Dict[str, float]:
+    """ 앱 import, lifespan 시작, 첫 요청 시간의 중앙값(ms)을 측정합니다. """
+    env = dict(os.environ)
+    # 측정 중에는 DB 연결 예열을 하지 않음 (네트워크 시간 제외)
+    env.setdefault("DB_POOL_WARMUP", "0")
+    samples = [json.loads(_run(["-c", _TIMING_SCRIPT], env).stdout.strip().splitlines()[-1]) for _ in range(runs)]
+    return {key: statistics.median(sample[key] for sample in samples) for key in samples[0]}
@@ -0,0 +1,104 @@
+"""
+히스토리 조회 응답 크기/직렬화 시간 벤치마크
+
+큰 세션 하나를 만들어 `GET /chats/{id}/messages` 응답을 비교합니다.
+- 직렬화: Pydantic 응답 모델 + 기본 JSON 인코더 vs 컬럼 dict + orjson
+- 응답 크기: 비압축 / gzip / brotli(설치 시), fields= 로 content 제외
+
+    cd server && python -m benchmarks.history_serialization --messages 300
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+
+_tmp_dir = tempfile.mkdtemp()
+os.environ.setdefault("MYSQL_USER", "bench")
+os.environ.setdefault("MYSQL_PASSWORD", "bench")
+os.environ.setdefault("MYSQL_DB", "bench")
+os.environ.setdefault("DEEPAUTO_API_KEY", "bench")
+os.environ["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+os.environ["DB_POOL_WARMUP"] = "0"
+
+import orjson  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.database import SessionLocal, get_engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.base import Base  # noqa: E402
+from app.models.chat import ChatSession, Message  # noqa: E402
+from app.schemas.chat import Message as MessageSchema  # noqa: E402
+from app.services.message_crud import message_crud  # noqa: E402
+from app.api.v1.endpoints.chat import MESSAGE_FIELDS  # noqa: E402
+from benchmarks.message_storage import make_text  # noqa: E402
+
+
+def median_ms(func, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=300)
+    parser.add_argument("--repeats", type=int, default=10)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(get_engine())
+    rng = random.Random(0)
+    with SessionLocal() as db:
+        chat = ChatSession(title="bench")
+        db.add(chat)
+        db.flush()
+        for i in range(args.messages):
+            size = rng.randint(50, 300) if i % 2 == 0 else rng.randint(2_000, 20_000)
+            db.add(Message(session_id=chat.id, role="user" if i % 2 == 0 else "assistant",
+                           content=make_text(rng, size)))
+        db.commit()
+        chat_id = chat.id
+
+    # 직렬화 비교 (DB 조회 제외)
+    with SessionLocal() as db:
+        orm_messages = message_crud.get_messages_by_session(db, chat_id, limit=args.messages)
+        rows = message_crud.get_message_rows(db, chat_id, MESSAGE_FIELDS, limit=args.messages)
+
+        def pydantic_json():
+            data = [MessageSchema.model_validate(m) for m in orm_messages]
+            return json.dumps(jsonable_encoder(data)).encode()
+
+        def orjson_rows():
+            return orjson.dumps(rows)
+
+        print("serialization (p50)")
+        print(f"  pydantic + json : {median_ms(pydantic_json, args.repeats):8.2f} ms")
+        print(f"  dict + orjson   : {median_ms(orjson_rows, args.repeats):8.2f} ms")
+
+    # 엔드투엔드 응답 크기 / 시간
+    url = f"/api/v1/chats/{chat_id}/messages?limit={args.messages}"
+    cases = [
+        ("identity", url, "identity"),
+        ("gzip", url, "gzip"),
+        ("br", url, "br"),
+        ("gzip, fields=-content", url + "&fields=id,role,created_at,tokens_used", "gzip"),
+    ]
+    print("response size / latency (p50)")
+    with TestClient(app) as client:
+        for name, case_url, encoding in cases:
+            response = client.get(case_url, headers={"Accept-Encoding": encoding})
+            wire_bytes = len(response.read()) if response.headers.get("content-encoding") is None \
+                else int(response.headers["content-length"])
+            actual = response.headers.get("content-encoding", "identity")
+            elapsed = median_ms(lambda: client.get(case_url, headers={"Accept-Encoding": encoding}), args.repeats)
+            print(f"  {name:<24} {actual:<9} {wire_bytes:>10} bytes {elapsed:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
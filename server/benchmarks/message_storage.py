@@ -0,0 +1,107 @@
+"""
+메시지 본문 저장 포맷 벤치마크
+
+포맷(none/zlib/zstd)별로 DB에 저장되는 바이트 수(= DB→앱 전송량)와
+대화 기록 로딩 시간을 비교합니다. 로컬 SQLite 파일을 사용합니다.
+
+    cd server && python -m benchmarks.message_storage --messages 200
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("MYSQL_USER", "bench")
+os.environ.setdefault("MYSQL_PASSWORD", "bench")
+os.environ.setdefault("MYSQL_DB", "bench")
+os.environ.setdefault("DEEPAUTO_API_KEY", "bench")
+
+from sqlalchemy import create_engine, func, select, type_coerce  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.types import LargeBinary  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.models.base import Base  # noqa: E402
+from app.models.chat import ChatSession, Message  # noqa: E402
+from app.models.types import get_content_codec  # noqa: E402
+from app.services.message_crud import message_crud  # noqa: E402
+
+WORDS = (
+    "먼저 문제를 정리해 보면 조건 을 만족하는 경우 따라서 결과는 다음과 같다 "
+    "let us think step by step the answer is therefore we need to check whether "
+    "수식 계산 검증 가정 반례 def return if else for in range value result"
+).split()
+
+
+def make_text(rng: random.Random, size: int) -> str:
+    parts, length = [], 0
+    while length < size:
+        word = rng.choice(WORDS)
+        parts.append(word)
+        length += len(word.encode("utf-8")) + 1
+    return " ".join(parts)
+
+
+def run(algorithm: str, messages: int, repeats: int, blob_dir: str) -> dict:
+    settings.MESSAGE_COMPRESSION = algorithm
+    settings.MESSAGE_BLOB_DIR = blob_dir
+    get_content_codec.cache_clear()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        SessionLocal = sessionmaker(bind=engine)
+
+        rng = random.Random(0)
+        with SessionLocal() as db:
+            chat = ChatSession(title="bench")
+            db.add(chat)
+            db.flush()
+            for i in range(messages):
+                # 사용자 질문은 짧고, 추론 모델 응답은 길다
+                size = rng.randint(50, 300) if i % 2 == 0 else rng.randint(2_000, 40_000)
+                db.add(Message(session_id=chat.id, role="user" if i % 2 == 0 else "assistant",
+                               content=make_text(rng, size)))
+            db.commit()
+            chat_id = chat.id
+
+            raw = type_coerce(Message.content, LargeBinary)
+            stored_bytes = db.execute(select(func.sum(func.length(raw)))).scalar()
+            text_bytes = sum(len(m.content.encode("utf-8")) for m in db.query(Message).all())
+
+        timings = []
+        for _ in range(repeats):
+            with SessionLocal() as db:
+                start = time.perf_counter()
+                history = message_crud.get_conversation_history(db, chat_id)
+                sum(len(m.content) for m in history)
+                timings.append((time.perf_counter() - start) * 1000)
+        engine.dispose()
+
+    return {
+        "algorithm": get_content_codec().algorithm,
+        "text_bytes": text_bytes,
+        "stored_bytes": stored_bytes,
+        "ratio": stored_bytes / text_bytes,
+        "load_ms_median": statistics.median(timings),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'format':<8} {'text bytes':>12} {'stored bytes':>13} {'ratio':>7} {'load ms (p50)':>14}")
+    with tempfile.TemporaryDirectory() as blob_dir:
+        for algorithm in ("none", "zlib", "zstd"):
+            result = run(algorithm, args.messages, args.repeats, blob_dir)
+            print(f"{result['algorithm']:<8} {result['text_bytes']:>12} {result['stored_bytes']:>13} "
+                  f"{result['ratio']:>7.2f} {result['load_ms_median']:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
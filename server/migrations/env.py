@@ -11,9 +11,9 @@ from sqlalchemy import pool
 
 from alembic import context
 
-# app 모듈에서 모델과 설정을 가져옴
+# app 모듈에서 모델과 설정만 가져옴 (FastAPI 앱/DB 엔진은 로드하지 않음)
 from app.models.base import Base
-from app.core.config import settings
+from app.core.config import get_settings
 
 # .env 파일 로드
 load_dotenv()
@@ -50,7 +50,7 @@ def run_migrations_offline() -> None:
 
     """
     # 환경 변수에서 DB URL 가져오기
-    url = settings.get_database_url
+    url = get_settings().get_database_url
     context.configure(
         url=url,
         target_metadata=target_metadata,
@@ -71,7 +71,7 @@ def run_migrations_online() -> None:
     """
     # SQLAlchemy 엔진 생성 시 환경 변수에서 URL 가져오기
     configuration = config.get_section(config.config_ini_section, {})
-    configuration["sqlalchemy.url"] = settings.get_database_url
+    configuration["sqlalchemy.url"] = get_settings().get_database_url
     connectable = engine_from_config(
         configuration,
         prefix="sqlalchemy.",
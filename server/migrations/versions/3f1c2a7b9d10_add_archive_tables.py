@@ -0,0 +1,60 @@
+"""add archive tables
+
+Revision ID: 3f1c2a7b9d10
+Revises: 1d0e7a5c3b42
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f1c2a7b9d10'
+down_revision: Union[str, Sequence[str], None] = '1d0e7a5c3b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'chat_sessions_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('session_id', sa.String(length=36), nullable=True),
+        sa.Column('title', sa.String(length=255), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('archived_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_chat_sessions_archive_session_id'), 'chat_sessions_archive', ['session_id'], unique=True)
+    op.create_index(op.f('ix_chat_sessions_archive_archived_at'), 'chat_sessions_archive', ['archived_at'], unique=False)
+    op.create_table(
+        'messages_archive',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('message_id', sa.String(length=36), nullable=True),
+        sa.Column('session_id', sa.Integer(), nullable=False),
+        sa.Column('role', sa.String(length=50), nullable=True),
+        sa.Column('content', sa.Text(), nullable=True),
+        sa.Column('tokens_used', sa.Integer(), nullable=True),
+        sa.Column('processing_time', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_messages_archive_message_id'), 'messages_archive', ['message_id'], unique=True)
+    op.create_index(op.f('ix_messages_archive_session_id'), 'messages_archive', ['session_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_messages_archive_session_id'), table_name='messages_archive')
+    op.drop_index(op.f('ix_messages_archive_message_id'), table_name='messages_archive')
+    op.drop_table('messages_archive')
+    op.drop_index(op.f('ix_chat_sessions_archive_archived_at'), table_name='chat_sessions_archive')
+    op.drop_index(op.f('ix_chat_sessions_archive_session_id'), table_name='chat_sessions_archive')
+    op.drop_table('chat_sessions_archive')
@@ -0,0 +1,76 @@
+"""add turn metrics
+
+턴별 성능 기록 테이블과 모델 x 1시간 롤업 테이블을 추가합니다.
+롤업은 `python -m app.cli rollup-metrics` 로 주기적으로 갱신합니다.
+
+Revision ID: 4b8d2f6e9a17
+Revises: e7b3f4a9c861
+Create Date: 2026-10-19 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b8d2f6e9a17'
+down_revision: Union[str, Sequence[str], None] = 'e7b3f4a9c861'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'turn_metrics',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('message_id', sa.Integer(), nullable=True),
+        sa.Column('session_id', sa.Integer(), nullable=False),
+        sa.Column('model', sa.String(length=100), nullable=False),
+        sa.Column('outcome', sa.String(length=20), nullable=False),
+        sa.Column('upstream_status', sa.Integer(), nullable=True),
+        sa.Column('upstream_ms', sa.Integer(), nullable=True),
+        sa.Column('ttft_ms', sa.Integer(), nullable=True),
+        sa.Column('total_ms', sa.Integer(), nullable=False),
+        sa.Column('db_ms', sa.Integer(), nullable=True),
+        sa.Column('retries', sa.Integer(), nullable=False),
+        sa.Column('prompt_tokens', sa.Integer(), nullable=True),
+        sa.Column('completion_tokens', sa.Integer(), nullable=True),
+        sa.Column('tokens_estimated', sa.Boolean(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['message_id'], ['messages.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('message_id')
+    )
+    op.create_index(op.f('ix_turn_metrics_session_id'), 'turn_metrics', ['session_id'], unique=False)
+    op.create_index(op.f('ix_turn_metrics_created_at'), 'turn_metrics', ['created_at'], unique=False)
+    op.create_index('ix_turn_metrics_model_created_at', 'turn_metrics', ['model', 'created_at'], unique=False)
+
+    op.create_table(
+        'turn_metric_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('model', sa.String(length=100), nullable=False),
+        sa.Column('turns', sa.Integer(), nullable=False),
+        sa.Column('failed_turns', sa.Integer(), nullable=False),
+        sa.Column('prompt_tokens', sa.Integer(), nullable=False),
+        sa.Column('completion_tokens', sa.Integer(), nullable=False),
+        sa.Column('stream_ms', sa.BigInteger(), nullable=False),
+        sa.Column('ttft_sum_ms', sa.BigInteger(), nullable=False),
+        sa.Column('total_sum_ms', sa.BigInteger(), nullable=False),
+        sa.Column('ttft_histogram', sa.JSON(), nullable=False),
+        sa.Column('total_histogram', sa.JSON(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('bucket_start', 'model', name='uq_turn_metric_rollups_bucket_model')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('turn_metric_rollups')
+    op.drop_index('ix_turn_metrics_model_created_at', table_name='turn_metrics')
+    op.drop_index(op.f('ix_turn_metrics_created_at'), table_name='turn_metrics')
+    op.drop_index(op.f('ix_turn_metrics_session_id'), table_name='turn_metrics')
+    op.drop_table('turn_metrics')
@@ -0,0 +1,50 @@
+"""store message content as blob
+
+메시지 본문을 압축/blob 참조가 가능한 MEDIUMBLOB 으로 변경합니다.
+기존 행은 UTF-8 원문 그대로 유효하므로 데이터 변환 없이 읽을 수 있고,
+압축은 `python -m app.cli compress-messages` 로 배치 적용합니다.
+
+Revision ID: 8a4e6d2c1b57
+Revises: 3f1c2a7b9d10
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a4e6d2c1b57'
+down_revision: Union[str, Sequence[str], None] = '3f1c2a7b9d10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('messages', 'messages_archive')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in TABLES:
+        op.alter_column(table, 'content', existing_type=sa.Text(), type_=mysql.MEDIUMBLOB(), existing_nullable=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    from app.models.types import get_content_codec
+
+    # 압축/blob 포맷으로 저장된 본문을 원문으로 되돌린 뒤 컬럼 타입 복구
+    codec = get_content_codec()
+    bind = op.get_bind()
+    for table in TABLES:
+        rows = bind.execute(
+            sa.text(f"SELECT id, content FROM {table} WHERE LEFT(content, 1) = X'FF'")
+        ).all()
+        for row_id, data in rows:
+            bind.execute(
+                sa.text(f"UPDATE {table} SET content = :content WHERE id = :id"),
+                {"id": row_id, "content": codec.decode(bytes(data)).encode("utf-8")}
+            )
+        op.alter_column(table, 'content', existing_type=mysql.MEDIUMBLOB(), type_=sa.Text(), existing_nullable=True)
@@ -0,0 +1,34 @@
+"""add streamed completion tokens to turn metric rollups
+
+tokens/sec 를 첫 토큰을 받은 턴의 completion_tokens 로만 계산하도록 롤업에 컬럼을 추가합니다.
+기존 롤업 행은 0 으로 채워지므로 `python -m app.cli rollup-metrics --since <처음 시각>` 으로 다시 집계합니다.
+
+Revision ID: 9c2e5b7d4f30
+Revises: 4b8d2f6e9a17
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c2e5b7d4f30'
+down_revision: Union[str, Sequence[str], None] = '4b8d2f6e9a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'turn_metric_rollups',
+        sa.Column('streamed_completion_tokens', sa.Integer(), nullable=False, server_default='0')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('turn_metric_rollups', 'streamed_completion_tokens')
@@ -0,0 +1,31 @@
+"""keep turn metric links when archiving
+
+보관 중인 메시지의 턴 성능 기록 연결을 유지하기 위해 turn_metrics.archived_message_id 를 추가합니다.
+세션을 보관하면 message_id 를 이 컬럼으로 옮기고, 복원하면 다시 message_id 로 되돌립니다.
+
+Revision ID: b1f4a8c3d602
+Revises: 9c2e5b7d4f30
+Create Date: 2026-10-19 18:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1f4a8c3d602'
+down_revision: Union[str, Sequence[str], None] = '9c2e5b7d4f30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('turn_metrics', sa.Column('archived_message_id', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('turn_metrics', 'archived_message_id')
@@ -0,0 +1,46 @@
+"""add message search
+
+검색용 원문 테이블과 ngram 파서 FULLTEXT 인덱스를 추가합니다.
+기존 메시지는 `python -m app.cli reindex-search` 로 색인합니다.
+
+Revision ID: c5d9e1f0a2b3
+Revises: 8a4e6d2c1b57
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d9e1f0a2b3'
+down_revision: Union[str, Sequence[str], None] = '8a4e6d2c1b57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'message_search',
+        sa.Column('message_id', sa.Integer(), nullable=False),
+        sa.Column('session_id', sa.Integer(), nullable=False),
+        sa.Column('content', sa.Text().with_variant(mysql.MEDIUMTEXT(), 'mysql'), nullable=True),
+        sa.ForeignKeyConstraint(['message_id'], ['messages.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('message_id')
+    )
+    op.create_index(op.f('ix_message_search_session_id'), 'message_search', ['session_id'], unique=False)
+    op.create_index(
+        'ix_message_search_content', 'message_search', ['content'], unique=False,
+        mysql_prefix='FULLTEXT', mysql_with_parser='ngram'
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_message_search_content', table_name='message_search')
+    op.drop_index(op.f('ix_message_search_session_id'), table_name='message_search')
+    op.drop_table('message_search')
@@ -0,0 +1,34 @@
+"""add message status
+
+스트리밍이 끝까지 완료되지 않은 턴의 메시지를 구분하기 위한 상태 컬럼을 추가합니다.
+
+Revision ID: e7b3f4a9c861
+Revises: c5d9e1f0a2b3
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b3f4a9c861'
+down_revision: Union[str, Sequence[str], None] = 'c5d9e1f0a2b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('messages', sa.Column('status', sa.String(length=20), nullable=True))
+    op.add_column('messages_archive', sa.Column('status', sa.String(length=20), nullable=True))
+    # 이전 버전이 남긴 빈 어시스턴트 메시지는 실패한 턴으로 표시
+    op.execute("UPDATE messages SET status = 'failed' WHERE role = 'assistant' AND (content IS NULL OR LENGTH(content) = 0)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('messages_archive', 'status')
+    op.drop_column('messages', 'status')
@@ -0,0 +1,34 @@
+import os
+import tempfile
+
+import pytest
+
+# 테스트는 실제 DB / DeepAuto API 없이 실행 (Settings 필수 값과 SQLite 경로만 지정)
+os.environ.setdefault("MYSQL_USER", "test")
+os.environ.setdefault("MYSQL_PASSWORD", "test")
+os.environ.setdefault("MYSQL_DB", "test")
+os.environ.setdefault("DEEPAUTO_API_KEY", "test")
+os.environ.setdefault(
+    "SQLALCHEMY_DATABASE_URI", "sqlite:///" + os.path.join(tempfile.gettempdir(), "deepauto_test.db")
+)
+os.environ.setdefault("DB_POOL_WARMUP", "0")
+
+
+@pytest.fixture
+def db():
+    """ 테스트마다 SQLite 테이블을 새로 만들고 세션을 제공합니다. """
+    from app.core.database import SessionLocal, get_engine
+    from app.models import Base
+    from app.services.search import LocalInvertedIndexBackend, search_service
+
+    engine = get_engine()
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    # 이전 테스트의 메모리 역색인을 비움
+    search_service._backends[LocalInvertedIndexBackend.name] = LocalInvertedIndexBackend()
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(engine)
@@ -0,0 +1,65 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import ChatSession, Message, MessageArchive, TurnMetric
+from app.schemas.chat import ChatSessionCreate, MessageCreate
+from app.services.archive import archive_service
+from app.services.chat_session_crud import chat_session_crud
+from app.services.message_crud import message_crud
+
+PERFORMANCE = {"model": "m1", "outcome": "incomplete", "total_ms": 900, "retries": 0, "tokens_estimated": True}
+
+
+def create_turn(db, title):
+    session = chat_session_crud.create_session(db, ChatSessionCreate(title=title))
+    message_crud.create_message(db, MessageCreate(role="user", content="질문"), session.id, status="incomplete")
+    assistant = message_crud.create_message(
+        db, MessageCreate(role="assistant", content="부분 응답"), session.id,
+        status="incomplete", performance=PERFORMANCE,
+    )
+    return session.id, assistant.id
+
+
+def test_archive_and_restore_round_trip(db):
+    session_id, assistant_id = create_turn(db, "보관할 대화")
+    kept_id, _ = create_turn(db, "남길 대화")
+    chat_session_crud.delete_session(db, session_id)
+
+    assert archive_service.archive_sessions(db) == 1
+    db.expire_all()
+    assert [s.id for s in db.query(ChatSession).all()] == [kept_id]
+    assert [(m.role, m.status) for m in db.query(MessageArchive).order_by(MessageArchive.id)] == [
+        ("user", "incomplete"), ("assistant", "incomplete"),
+    ]
+    metric = db.query(TurnMetric).filter(TurnMetric.session_id == session_id).one()
+    assert (metric.message_id, metric.archived_message_id) == (None, assistant_id)
+
+    assert archive_service.restore_session(db, session_id)
+    db.expire_all()
+    restored = db.query(Message).filter(Message.session_id == session_id).order_by(Message.id).all()
+    assert [(m.role, m.content, m.status) for m in restored] == [
+        ("user", "질문", "incomplete"), ("assistant", "부분 응답", "incomplete"),
+    ]
+    assert db.query(MessageArchive).count() == 0
+    metric = db.query(TurnMetric).filter(TurnMetric.session_id == session_id).one()
+    assert (metric.message_id, metric.archived_message_id) == (assistant_id, None)
+    assert not archive_service.restore_session(db, session_id)
+
+
+def test_bulk_delete_and_title_update(db):
+    first, _ = create_turn(db, "a")
+    second, _ = create_turn(db, "b")
+    client = TestClient(app)
+
+    response = client.patch("/api/v1/chats/bulk-title", json={"items": [
+        {"id": first, "title": "새 제목"}, {"id": 999, "title": "없음"},
+    ]})
+    assert response.json() == {"affected": 1}
+    assert client.post("/api/v1/chats/bulk-delete", json={"ids": [first, second, 999]}).json() == {"affected": 2}
+    # 이미 삭제된 세션은 다시 세지 않음
+    assert client.post("/api/v1/chats/bulk-delete", json={"ids": [first]}).json() == {"affected": 0}
+
+    db.expire_all()
+    assert [(s.title, s.is_active) for s in db.query(ChatSession).order_by(ChatSession.id)] == [
+        ("새 제목", False), ("b", False),
+    ]
@@ -0,0 +1,55 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.schemas.chat import ChatSessionCreate, MessageCreate
+from app.services.chat_session_crud import chat_session_crud
+from app.services.message_crud import message_crud
+
+
+@pytest.fixture
+def chat_id(db):
+    session = chat_session_crud.create_session(db, ChatSessionCreate(title="제목"))
+    message_crud.create_message(db, MessageCreate(role="user", content="질문 " * 500), session.id)
+    message_crud.create_message(db, MessageCreate(role="assistant", content="답변"), session.id)
+    return session.id
+
+
+def test_message_projection_omits_unrequested_fields(chat_id):
+    client = TestClient(app)
+
+    full = client.get(f"/api/v1/chats/{chat_id}/messages").json()
+    assert set(full[0]) == {
+        "id", "message_id", "session_id", "role", "content", "created_at", "tokens_used", "processing_time", "status",
+    }
+    # ORJSON 은 datetime 을 ISO 8601 문자열로 직렬화
+    assert "T" in full[0]["created_at"]
+
+    projected = client.get(f"/api/v1/chats/{chat_id}/messages", params={"fields": "id, role"}).json()
+    assert projected == [{"id": m["id"], "role": m["role"]} for m in full]
+
+
+def test_session_list_projection_skips_messages(chat_id):
+    client = TestClient(app)
+
+    sessions = client.get("/api/v1/chats/", params={"fields": "id,title"}).json()
+    assert sessions == [{"id": chat_id, "title": "제목"}]
+    with_messages = client.get("/api/v1/chats/", params={"fields": "id,messages"}).json()
+    assert [m["role"] for m in with_messages[0]["messages"]] == ["user", "assistant"]
+
+
+@pytest.mark.parametrize("fields", [",", " , ,", "", "id,unknown"])
+def test_invalid_fields_return_400(chat_id, fields):
+    client = TestClient(app)
+
+    assert client.get(f"/api/v1/chats/{chat_id}/messages", params={"fields": fields}).status_code == 400
+    assert client.get("/api/v1/chats/", params={"fields": fields}).status_code == 400
+
+
+def test_large_history_is_compressed(chat_id):
+    response = TestClient(app).get(
+        f"/api/v1/chats/{chat_id}/messages", headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    # content-length 는 압축된 크기, response.content 는 httpx 가 푼 본문
+    assert len(response.content) > int(response.headers["content-length"])
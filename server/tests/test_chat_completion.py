@@ -0,0 +1,187 @@
+import json
+
+import anyio
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.main import app
+from app.models import Message, TurnMetric
+from app.schemas.chat import ChatSessionCreate
+from app.services.chat_session_crud import ChatSessionCRUD
+
+
+def chunk(content=None, finish_reason=None, usage=None) -> str:
+    data = {"id": "c1", "object": "chat.completion.chunk", "created": 1, "model": "deepauto/qwq-32b", "choices": []}
+    if content is not None or finish_reason is not None:
+        data["choices"] = [{"index": 0, "delta": {"content": content or ""}, "finish_reason": finish_reason}]
+    if usage is not None:
+        data["usage"] = usage
+    return f"data: {json.dumps(data)}\n\n"
+
+
+USAGE = {"prompt_tokens": 5, "completion_tokens": 2, "total_tokens": 7}
+COMPLETE_STREAM = [chunk(""), chunk("안녕"), chunk("하세요", "stop"), chunk(usage=USAGE), "data: [DONE]\n\n"]
+
+
+def parse_events(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.fixture
+def session_id(db, monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+    return ChatSessionCRUD().create_session(db, ChatSessionCreate(title="")).id
+
+
+@pytest.fixture
+def use_upstream():
+    """ 업스트림 응답을 httpx.MockTransport 로 대체합니다. """
+    def install(handler):
+        app.state.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return install
+
+
+def post_chat(chat_id, message="질문"):
+    # lifespan 을 실행하지 않도록 with 블록 없이 사용 (http_client 는 use_upstream 으로 지정)
+    return TestClient(app).post("/api/v1/chat", json={"chat_id": chat_id, "message": message})
+
+
+def rows(db):
+    db.expire_all()
+    return db.query(Message).order_by(Message.id).all()
+
+
+def test_stream_event_order_and_rows(db, session_id, use_upstream):
+    sent = {}
+
+    def handler(request):
+        sent.update(json.loads(request.content))
+        return httpx.Response(200, content="".join(COMPLETE_STREAM).encode())
+
+    use_upstream(handler)
+    response = post_chat(session_id)
+
+    assert response.status_code == 200
+    events = parse_events(response.text)
+    assert [name for name, _ in events] == ["start", "delta", "delta", "delta", "usage", "done"]
+    assert "".join(data["choices"][0]["delta"]["content"] for name, data in events if name == "delta") == "안녕하세요"
+    assert events[-2][1] == USAGE
+    assert sent["stream_options"] == {"include_usage": True}
+
+    user, assistant = rows(db)
+    assert (user.role, user.content, user.status) == ("user", "질문", "complete")
+    assert (assistant.role, assistant.content, assistant.status) == ("assistant", "안녕하세요", "complete")
+    assert assistant.tokens_used == 7
+    assert events[-1][1] == {"message_id": assistant.id, "finish_reason": "stop"}
+
+    metric = db.query(TurnMetric).one()
+    assert (metric.message_id, metric.outcome, metric.completion_tokens) == (assistant.id, "complete", 2)
+
+
+def test_stream_error_after_first_token_marks_both_rows(db, session_id, use_upstream):
+    async def body():
+        yield chunk("부분").encode()
+        raise httpx.ReadError("connection reset")
+
+    use_upstream(lambda request: httpx.Response(200, content=body()))
+    events = parse_events(post_chat(session_id).text)
+
+    assert [name for name, _ in events] == ["start", "delta", "error"]
+    assert events[-1][1]["code"] == "upstream_stream_error"
+    assert [(m.role, m.content, m.status) for m in rows(db)] == [
+        ("user", "질문", "failed"), ("assistant", "부분", "failed"),
+    ]
+
+
+def test_empty_stream_writes_nothing(db, session_id, use_upstream):
+    use_upstream(lambda request: httpx.Response(200, content=b"data: [DONE]\n\n"))
+    events = parse_events(post_chat(session_id).text)
+
+    assert [name for name, _ in events] == ["start", "error"]
+    assert events[-1][1]["code"] == "empty_response"
+    assert rows(db) == []
+
+
+def raising(exc):
+    def handler(request):
+        raise exc
+    return handler
+
+
+@pytest.mark.parametrize("handler, status_code, code, upstream_status", [
+    (lambda request: httpx.Response(503), 502, "upstream_error", 503),
+    (raising(httpx.ConnectError("refused")), 502, "upstream_unavailable", None),
+    (raising(httpx.ReadTimeout("slow")), 504, "upstream_timeout", None),
+])
+def test_upstream_failures_fail_fast(db, session_id, use_upstream, handler, status_code, code, upstream_status):
+    use_upstream(handler)
+    response = post_chat(session_id)
+
+    assert response.status_code == status_code
+    assert response.json()["detail"]["code"] == code
+    assert rows(db) == []
+    metric = db.query(TurnMetric).one()
+    assert (metric.message_id, metric.outcome, metric.upstream_status) == (None, "failed", upstream_status)
+
+
+def test_unknown_session_returns_404_without_calling_upstream(db, session_id, use_upstream):
+    use_upstream(raising(AssertionError("upstream must not be called")))
+    assert post_chat(session_id + 1).status_code == 404
+    assert rows(db) == []
+
+
+class StalledStream(httpx.AsyncByteStream):
+    """ 첫 청크 뒤 멈추는 업스트림. 실제 연결처럼 닫을 때도 이벤트 루프로 제어를 넘깁니다. """
+
+    async def __aiter__(self):
+        yield chunk("부분 응답").encode()
+        await anyio.sleep_forever()
+
+    async def aclose(self):
+        await anyio.sleep(0)
+
+
+def test_client_disconnect_mid_stream_marks_turn_incomplete(db, session_id, use_upstream):
+    use_upstream(lambda request: httpx.Response(200, stream=StalledStream()))
+    request_body = json.dumps({"chat_id": session_id, "message": "질문"}).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": "/api/v1/chat", "raw_path": b"/api/v1/chat", "query_string": b"",
+        "headers": [(b"content-type", b"application/json"), (b"host", b"test")],
+        "client": ("127.0.0.1", 1234), "server": ("test", 80),
+    }
+    sent = []
+
+    async def scenario():
+        first_delta = anyio.Event()
+        request_sent = False
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {"type": "http.request", "body": request_body, "more_body": False}
+            await first_delta.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+            if b"event: delta" in message.get("body", b""):
+                first_delta.set()
+
+        with anyio.fail_after(5):
+            await app(scope, receive, send)
+
+    anyio.run(scenario)
+
+    assert any(b"event: delta" in message.get("body", b"") for message in sent)
+    assert [(m.role, m.content, m.status) for m in rows(db)] == [
+        ("user", "질문", "incomplete"), ("assistant", "부분 응답", "incomplete"),
+    ]
+    assert db.query(TurnMetric).one().outcome == "incomplete"
@@ -0,0 +1,85 @@
+import os
+
+import pytest
+
+from app.core.config import settings
+from app.models import Message, MessageSearch
+from app.models.types import get_content_codec
+from app.schemas.chat import ChatSessionCreate, MessageCreate
+from app.services.chat_session_crud import ChatSessionCRUD
+from app.services.export import export_service
+from app.services.message_crud import MessageCRUD
+from app.utils.compression import MISSING_BLOB_PLACEHOLDER, ContentCodec, LocalBlobStore
+
+
+def make_codec(root) -> ContentCodec:
+    return ContentCodec(min_bytes=16, blob_threshold_bytes=64, blob_store=LocalBlobStore(str(root)))
+
+
+def test_missing_blob_decodes_to_placeholder(tmp_path):
+    codec = make_codec(tmp_path)
+    text = "긴 본문 " * 100
+    encoded = codec.encode(text)
+    key = codec.blob_key(encoded)
+    assert key is not None
+    assert codec.decode(encoded) == text
+
+    # 다른 인스턴스의 로컬 디스크에만 있던 blob 처럼 파일이 없으면 오류 대신 대체 문자열
+    os.remove(codec.blob_store._path(key))
+    assert codec.decode(encoded) == MISSING_BLOB_PLACEHOLDER
+
+
+def test_remove_unreferenced_blobs(tmp_path):
+    codec = make_codec(tmp_path)
+    kept = codec.blob_key(codec.encode("유지 " * 100))
+    orphan = codec.blob_key(codec.encode("삭제 " * 100))
+
+    # 방금 만든 blob 은 커밋 전일 수 있으므로 유지
+    assert codec.blob_store.remove_unreferenced({kept}) == 0
+    assert codec.blob_store.remove_unreferenced({kept}, min_age_seconds=0, dry_run=True) == 1
+    assert set(codec.blob_store.keys()) == {kept, orphan}
+
+    assert codec.blob_store.remove_unreferenced({kept}, min_age_seconds=0) == 1
+    assert list(codec.blob_store.keys()) == [kept]
+
+
+def test_put_refreshes_mtime_of_existing_blob(tmp_path):
+    codec = make_codec(tmp_path)
+    encoded = codec.encode("같은 본문 " * 100)
+    path = codec.blob_store._path(codec.blob_key(encoded))
+    os.utime(path, (0, 0))
+
+    # 같은 본문을 새 메시지가 다시 저장하면 gc 유예 시간이 다시 시작됨
+    assert codec.encode("같은 본문 " * 100) == encoded
+    assert codec.blob_store.remove_unreferenced(set()) == 0
+    assert os.path.getmtime(path) > 0
+
+
+@pytest.fixture
+def blob_settings(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "MESSAGE_COMPRESSION_MIN_BYTES", 16)
+    monkeypatch.setattr(settings, "MESSAGE_BLOB_THRESHOLD_BYTES", 64)
+    monkeypatch.setattr(settings, "MESSAGE_BLOB_DIR", str(tmp_path))
+    get_content_codec.cache_clear()
+    yield get_content_codec()
+    get_content_codec.cache_clear()
+
+
+def test_export_flags_missing_blob_and_import_skips_it(db, blob_settings):
+    session = ChatSessionCRUD().create_session(db, ChatSessionCreate(title="t"))
+    message_crud = MessageCRUD()
+    message_crud.create_message(db, MessageCreate(role="user", content="짧은 본문"), session.id)
+    message_crud.create_message(db, MessageCreate(role="assistant", content="긴 본문 " * 100), session.id)
+    for key in list(blob_settings.blob_store.keys()):
+        os.remove(blob_settings.blob_store._path(key))
+
+    records = [r for r in export_service.iter_records(db) if r["type"] == "message"]
+    assert [(r["content"], r.get("content_missing")) for r in records] == [("짧은 본문", None), (None, True)]
+
+    # 다른 DB 로 옮기는 상황: 기존 행을 지우고 다시 가져옴
+    db.query(MessageSearch).delete()
+    db.query(Message).delete()
+    db.commit()
+    stats = export_service.import_records(db, records)
+    assert (stats["messages"], stats["missing_content_messages"]) == (1, 1)
+    assert [m.content for m in db.query(Message).all()] == ["짧은 본문"]
@@ -0,0 +1,70 @@
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.core.database import TimedQueuePool, get_engine, get_pool_status, pool_stats, warm_pool
+
+STREAM = (
+    'data: {"model": "deepauto/qwq-32b", "choices": [{"delta": {"content": "안녕"}, "finish_reason": "stop"}]}\n\n'
+    "data: [DONE]\n\n"
+).encode()
+
+
+def test_timed_pool_records_checkout_waits_and_timeouts(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", poolclass=TimedQueuePool,
+        pool_size=1, max_overflow=0, pool_timeout=0.05,
+    )
+    before = pool_stats.snapshot()
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            # 풀이 꽉 찬 상태에서의 체크아웃은 timeout 으로 기록
+            with pytest.raises(PoolTimeoutError):
+                engine.connect()
+    finally:
+        engine.dispose()
+
+    after = pool_stats.snapshot()
+    assert after["checkouts"] == before["checkouts"] + 1
+    assert after["timeouts"] == before["timeouts"] + 1
+    assert after["max_wait_ms"] >= after["last_wait_ms"] >= 0
+
+
+def test_warm_pool_and_pool_status():
+    assert warm_pool(2) == 2
+    status = get_pool_status()
+    assert status["checked_in"] >= 2
+    assert set(status) == {"size", "checked_in", "checked_out", "overflow", "max_overflow", "ping_strategy", "wait"}
+
+    with get_engine().connect():
+        assert get_pool_status()["checked_out"] == status["checked_out"] + 1
+    assert get_pool_status()["checked_out"] == status["checked_out"]
+
+
+def test_chat_stream_releases_connections(db, monkeypatch):
+    from app.core.config import settings
+    from app.main import app
+    from app.schemas.chat import ChatSessionCreate
+    from app.services.chat_session_crud import chat_session_crud
+
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+    chat_id = chat_session_crud.create_session(db, ChatSessionCreate(title="t")).id
+    db.close()
+    baseline = get_pool_status()["checked_out"]
+    checked_out = []
+
+    def handler(request):
+        # 업스트림에 요청을 보내는 시점의 풀 상태 기록
+        # (세션 확인 / 대화 기록 조회에 쓴 커넥션은 응답을 기다리기 전에 풀에 반환되어 있어야 함)
+        checked_out.append(get_pool_status()["checked_out"])
+        return httpx.Response(200, content=STREAM)
+
+    app.state.http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    response = TestClient(app).post("/api/v1/chat", json={"chat_id": chat_id, "message": "질문"})
+    assert response.status_code == 200
+    assert checked_out == [baseline]
+    # 턴 저장에 쓴 커넥션도 스트림이 끝나면 반환됨
+    assert get_pool_status()["checked_out"] == baseline
@@ -0,0 +1,115 @@
+import orjson
+from fastapi.testclient import TestClient
+
+from app import cli
+from app.core.config import settings
+from app.main import app
+from app.models import ChatSession, Message, MessageSearch
+from app.schemas.chat import ChatSessionCreate, MessageCreate
+from app.services import export
+from app.services.chat_session_crud import chat_session_crud
+from app.services.export import RecentCache, export_service
+from app.services.message_crud import message_crud
+
+
+def create_conversations(db):
+    first = chat_session_crud.create_session(db, ChatSessionCreate(title="첫 대화"))
+    second = chat_session_crud.create_session(db, ChatSessionCreate(title="두 번째 대화"))
+    # 세션이 번갈아 나오도록 메시지 id 순서를 섞음
+    for session, role, content in [
+        (first, "user", "질문 1"), (second, "user", "질문 2"), (first, "assistant", "답변 1"),
+    ]:
+        message_crud.create_message(db, MessageCreate(role=role, content=content), session.id)
+    return first.session_id, second.session_id
+
+
+def empty_database(db):
+    """ 다른 DB 로 옮기는 상황: 가져오기 전에 운영 테이블을 비움 """
+    db.query(MessageSearch).delete()
+    db.query(Message).delete()
+    db.query(ChatSession).delete()
+    db.commit()
+
+
+def conversation_rows(db):
+    db.expire_all()
+    return [
+        (m.session.session_id, m.role, m.content)
+        for m in db.query(Message).order_by(Message.created_at, Message.id)
+    ]
+
+
+def test_export_api_is_disabled_by_default(db):
+    assert TestClient(app).get("/api/v1/export/").status_code == 404
+
+
+def test_ndjson_round_trip_through_api(db, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_API_ENABLED", True)
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+    create_conversations(db)
+    expected = conversation_rows(db)
+
+    response = TestClient(app).get("/api/v1/export/")
+    assert response.status_code == 200
+    records = list(export_service.iter_ndjson_records(response.content.splitlines()))
+    assert [r["type"] for r in records] == ["session", "message", "session", "message", "message", "checkpoint"]
+    assert records[-1] == {"type": "checkpoint", "last_message_id": records[-2]["id"], "messages": 3}
+
+    empty_database(db)
+    stats = export_service.import_records(db, records, batch_size=2)
+    assert stats == {
+        "sessions": 2, "messages": 3, "skipped_messages": 0, "orphan_messages": 0, "missing_content_messages": 0,
+    }
+    assert conversation_rows(db) == expected
+    # 가져온 메시지도 검색 색인에 반영됨
+    assert db.query(MessageSearch).count() == 3
+
+    # 같은 파일을 다시 가져와도 중복 저장하지 않음
+    stats = export_service.import_records(db, records)
+    assert (stats["sessions"], stats["messages"], stats["skipped_messages"]) == (0, 0, 3)
+    assert conversation_rows(db) == expected
+
+
+def test_import_counts_orphan_messages(db):
+    first_uuid, second_uuid = create_conversations(db)
+    records = [r for r in export_service.iter_records(db) if r["type"] == "message"]
+
+    # 첫 번째 세션만 대상 DB 에 있음: 세션 레코드가 없어도 session_uuid 로 찾아 연결
+    db.query(MessageSearch).delete()
+    db.query(Message).delete()
+    db.query(ChatSession).filter(ChatSession.session_id == second_uuid).delete()
+    db.commit()
+
+    stats = export_service.import_records(db, records)
+    assert (stats["sessions"], stats["messages"], stats["orphan_messages"]) == (0, 2, 1)
+    assert conversation_rows(db) == [(first_uuid, "user", "질문 1"), (first_uuid, "assistant", "답변 1")]
+
+
+def test_evicted_session_is_exported_again(db, monkeypatch):
+    first_uuid, second_uuid = create_conversations(db)
+    monkeypatch.setattr(export, "RecentCache", lambda: RecentCache(max_size=1))
+
+    records = list(export_service.iter_records(db))
+    sessions = [r["session_id"] for r in records if r["type"] == "session"]
+    # 캐시에서 밀려난 첫 세션은 세 번째 메시지 앞에서 한 번 더 나옴
+    assert sessions == [first_uuid, second_uuid, first_uuid]
+
+    # 중복된 세션 레코드는 가져오기에서 기존 세션으로 연결됨
+    empty_database(db)
+    stats = export_service.import_records(db, records)
+    assert (stats["sessions"], stats["messages"]) == (2, 3)
+
+
+def test_export_and_import_cli(db, tmp_path, capsys):
+    create_conversations(db)
+    expected = conversation_rows(db)
+    path = tmp_path / "chats.ndjson"
+
+    assert cli.main(["export", "--output", str(path)]) == 0
+    assert "내보낸 메시지 수: 3" in capsys.readouterr().err
+    assert orjson.loads(path.read_bytes().splitlines()[-1])["messages"] == 3
+
+    empty_database(db)
+    assert cli.main(["import", str(path)]) == 0
+    assert "가져온 세션 수: 2, 메시지 수: 3" in capsys.readouterr().out
+    assert conversation_rows(db) == expected
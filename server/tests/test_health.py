@@ -0,0 +1,82 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.v1.endpoints import health
+from app.main import app
+from app.schemas.chat import ChatSessionCreate
+from app.services.archive import archive_service
+from app.services.chat_session_crud import active_session_counter, chat_session_crud
+
+
+def count_loads(monkeypatch, cache):
+    """ 캐시의 loader 호출 횟수를 기록합니다. """
+    calls = []
+    loader = cache._loader
+
+    def counting_loader():
+        calls.append(1)
+        return loader()
+
+    monkeypatch.setattr(cache, "_loader", counting_loader)
+    cache.invalidate()
+    return calls
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    # 다른 테스트의 DB 상태로 채워진 캐시가 남지 않도록 전후로 비움
+    health.db_ping.invalidate()
+    active_session_counter.invalidate()
+    yield
+    health.db_ping.invalidate()
+    active_session_counter.invalidate()
+
+
+def test_live_does_no_io():
+    assert TestClient(app).get("/api/v1/health/live").json() == {"status": "ok"}
+
+
+def test_ready_pings_once_per_ttl(db, monkeypatch):
+    calls = count_loads(monkeypatch, health.db_ping)
+    client = TestClient(app)
+
+    for _ in range(3):
+        response = client.get("/api/v1/health/ready")
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok", "database": "healthy"}
+    assert len(calls) == 1
+
+
+def test_ready_returns_503_when_ping_fails(monkeypatch):
+    monkeypatch.setattr(health.db_ping, "_loader", lambda: "error: connection refused")
+
+    response = TestClient(app).get("/api/v1/health/ready")
+    assert response.status_code == 503
+    assert response.json() == {"status": "unavailable", "database": "error: connection refused"}
+
+
+def test_health_active_sessions_follow_writes_without_reloading(db, monkeypatch):
+    calls = count_loads(monkeypatch, active_session_counter)
+    client = TestClient(app)
+
+    def active_sessions():
+        return client.get("/api/v1/health/").json()["database"]["active_sessions"]
+
+    first = chat_session_crud.create_session(db, ChatSessionCreate(title="a")).id
+    assert active_sessions() == 1
+    assert len(calls) == 1
+
+    # 이후의 생성 / 삭제는 카운터 증감으로만 반영
+    second = chat_session_crud.create_session(db, ChatSessionCreate(title="b")).id
+    third = chat_session_crud.create_session(db, ChatSessionCreate(title="c")).id
+    assert active_sessions() == 3
+    chat_session_crud.delete_session(db, first)
+    assert active_sessions() == 2
+    chat_session_crud.bulk_delete_sessions(db, [second, third])
+    assert active_sessions() == 0
+    assert len(calls) == 1
+
+    # 보관 작업은 카운터를 무효화하여 다음 조회에서 DB 를 다시 읽음
+    assert archive_service.archive_sessions(db) == 3
+    assert active_sessions() == 0
+    assert len(calls) == 2
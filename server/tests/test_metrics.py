@@ -0,0 +1,85 @@
+import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.models import TurnMetric, TurnMetricRollup
+from app.services.metrics import LATENCY_BUCKETS_MS, LatencyHistogram, metrics_service
+
+T0 = datetime.datetime(2026, 10, 1, 9, 0)
+
+
+def add_turn(db, minutes, model="m1", outcome="complete", ttft_ms=100, total_ms=1100, completion_tokens=50):
+    db.add(TurnMetric(
+        session_id=1, model=model, outcome=outcome, ttft_ms=ttft_ms, total_ms=total_ms, retries=0,
+        prompt_tokens=10, completion_tokens=completion_tokens, tokens_estimated=False,
+        created_at=T0 + datetime.timedelta(minutes=minutes),
+    ))
+
+
+def test_histogram_percentiles_and_merge():
+    first, second = LatencyHistogram(), LatencyHistogram()
+    for value in range(1, 101):
+        (first if value % 2 else second).add(value * 10)
+    first.merge(second.counts)
+
+    assert first.total == 100
+    # 구간 경계가 20% 간격이므로 근사 오차도 20% 이내
+    assert first.percentile(0.5) == pytest.approx(500, rel=0.2)
+    assert first.percentile(0.99) == pytest.approx(990, rel=0.2)
+
+    first.add(LATENCY_BUCKETS_MS[-1] + 1)
+    assert first.counts[-1] == 1
+    assert LatencyHistogram().percentile(0.5) is None
+
+
+def test_rollup_matches_raw_turns_and_is_idempotent(db):
+    for minutes in (0, 10, 70):
+        add_turn(db, minutes)
+    add_turn(db, 20, outcome="failed", ttft_ms=None, total_ms=300, completion_tokens=30)
+    add_turn(db, 30, model="m2", ttft_ms=200, total_ms=2200)
+    db.commit()
+    until = T0 + datetime.timedelta(hours=2)
+    raw = metrics_service.get_latency_summary(db, T0, until)
+
+    assert metrics_service.rollup(db, until=until) == 3
+    assert metrics_service.rollup(db, since=T0, until=until) == 3
+    assert db.query(TurnMetricRollup).count() == 3
+    rolled = metrics_service.get_latency_summary(db, T0, until)
+
+    assert rolled["rolled_up_until"] == until
+    assert rolled["items"] == raw["items"]
+    first = rolled["items"][0]
+    assert (first["model"], first["turns"], first["failed_turns"], first["completion_tokens"]) == ("m1", 3, 1, 130)
+    # 실패한 턴(첫 토큰 없음)은 tokens/sec 에 포함하지 않음: 100 토큰 / 2초
+    assert first["tokens_per_second"] == 50.0
+
+
+def test_summary_combines_rollups_with_recent_turns(db):
+    add_turn(db, 0)
+    db.commit()
+    metrics_service.rollup(db, until=T0 + datetime.timedelta(hours=1))
+    add_turn(db, 90)
+    db.commit()
+
+    summary = metrics_service.get_latency_summary(db, T0, T0 + datetime.timedelta(days=1), bucket="day")
+    assert [(item["bucket_start"], item["turns"]) for item in summary["items"]] == [(T0.replace(hour=0), 2)]
+
+
+def test_latency_endpoint(db):
+    add_turn(db, 0)
+    add_turn(db, 5, model="m2")
+    db.commit()
+    client = TestClient(app)
+
+    response = client.get("/api/v1/metrics/latency", params={
+        "start": T0.isoformat(), "end": (T0 + datetime.timedelta(hours=1)).isoformat(), "model": "m2",
+    })
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [(item["model"], item["turns"]) for item in items] == [("m2", 1)]
+    assert items[0]["ttft_ms"]["avg"] == 100.0
+
+    response = client.get("/api/v1/metrics/latency", params={"start": T0.isoformat(), "end": T0.isoformat()})
+    assert response.status_code == 400
@@ -0,0 +1,168 @@
+import asyncio
+import time
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.core.config import settings
+from app.services.rate_limit import (
+    MemoryRateLimitBackend, RateLimiter, RedisRateLimitBackend, hash_api_key, resolve_rate_limit_key,
+    resolve_rate_limit_keys,
+)
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def redis_backend():
+    # TOKEN_BUCKET_SCRIPT 실행에는 fakeredis[lua] 필요
+    pytest.importorskip("lupa")
+    return RedisRateLimitBackend(fakeredis.FakeRedis())
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(settings, "RATE_LIMIT_REQUESTS_PER_MINUTE", 60.0)
+    monkeypatch.setattr(settings, "RATE_LIMIT_BURST", 3)
+    monkeypatch.setattr(settings, "RATE_LIMIT_TOKEN_BUDGET", 100)
+    monkeypatch.setattr(settings, "RATE_LIMIT_TOKEN_WINDOW_SECONDS", 3600)
+
+
+def test_token_bucket_script_matches_memory_backend(redis_backend):
+    memory_backend = MemoryRateLimitBackend()
+    # burst 3 소진 → 거절 → 1초(rate 1/s) 후 1개 회복
+    steps = [1000.0, 1000.0, 1000.0, 1000.0, 1000.5, 1001.0, 1001.0]
+    redis_results = [redis_backend.take("k", 1.0, 3, now) for now in steps]
+    memory_results = [memory_backend.take("k", 1.0, 3, now) for now in steps]
+
+    assert redis_results == pytest.approx(memory_results)
+    assert redis_results[:3] == [0.0, 0.0, 0.0]
+    assert redis_results[3] == pytest.approx(1.0)
+    assert redis_results[5] == 0.0
+    assert redis_results[6] > 0
+
+
+def test_redis_slot_counters(redis_backend):
+    redis_backend.incr("tokens:k", 10, 5, ttl=60)
+    redis_backend.incr("tokens:k", 10, 7, ttl=60)
+    redis_backend.incr("tokens:k", 11, 1, ttl=60)
+
+    assert redis_backend.get_slots("tokens:k", [9, 10, 11]) == [0, 12, 1]
+    assert 0 < redis_backend.client.ttl("rl:count:tokens:k:10") <= 60
+
+
+def test_limiter_rejects_after_burst_with_retry_after(redis_backend, limits):
+    limiter = RateLimiter(redis_backend)
+    for _ in range(3):
+        limiter.check("ip:1", now=1000.0)
+
+    with pytest.raises(HTTPException) as exc_info:
+        limiter.check("ip:1", now=1000.0)
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.headers["Retry-After"] == "1"
+
+    # 다른 키는 영향 없음
+    limiter.check("ip:2", now=1000.0)
+
+
+def test_limiter_token_budget_shared_across_instances(redis_backend, limits):
+    # 같은 Redis 를 쓰는 두 워커
+    worker_a = RateLimiter(redis_backend)
+    worker_b = RateLimiter(RedisRateLimitBackend(redis_backend.client))
+
+    worker_a.check("key:abc", now=1000.0)
+    worker_a.record_tokens("key:abc", 100, now=1000.0)
+
+    usage = worker_b.get_usage("key:abc", now=1001.0)
+    assert usage.tokens_used == 100
+    assert usage.tokens_remaining == 0
+    with pytest.raises(HTTPException) as exc_info:
+        worker_b.check("key:abc", now=1001.0)
+    assert exc_info.value.detail == "Token budget exceeded"
+    # 윈도우가 지나면 다시 허용
+    worker_b.check("key:abc", now=1000.0 + 3600 + 60)
+
+
+def test_usage_endpoint_uses_session_key(monkeypatch, limits):
+    from app.main import app
+    from app.services.rate_limit import rate_limiter
+
+    monkeypatch.setattr(settings, "RATE_LIMIT_KEY_STRATEGY", "session")
+    monkeypatch.setattr(rate_limiter, "_backend", MemoryRateLimitBackend())
+    rate_limiter.record_tokens("session:7", 42)
+
+    client = TestClient(app)
+    response = client.get("/api/v1/usage/?chat_id=7")
+    assert response.status_code == 200
+    assert response.json()["key"] == "session:7"
+    assert response.json()["tokens_used"] == 42
+
+    assert client.get("/api/v1/usage/").status_code == 400
+
+
+def test_async_check_with_shared_backend(redis_backend, limits):
+    limiter = RateLimiter(redis_backend)
+
+    async def scenario():
+        for _ in range(3):
+            await limiter.acheck("ip:3")
+        with pytest.raises(HTTPException):
+            await limiter.acheck("ip:3")
+
+    asyncio.run(scenario())
+    limiter.record_tokens("ip:3", 30)
+    assert limiter.get_usage("ip:3").tokens_used == 30
+
+
+def make_request(api_key=None, host="10.0.0.1") -> Request:
+    headers = [(b"x-api-key", api_key.encode())] if api_key else []
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": headers, "client": (host, 1234)})
+
+
+def test_rotating_unknown_api_keys_does_not_reset_limit(monkeypatch, limits):
+    monkeypatch.setattr(settings, "RATE_LIMIT_KEY_STRATEGY", "api_key")
+    monkeypatch.setattr(settings, "RATE_LIMIT_API_KEY_HASHES", [hash_api_key("registered")])
+    limiter = RateLimiter(MemoryRateLimitBackend())
+
+    # 등록되지 않은 키는 매번 바꿔 보내도 같은 IP 버킷을 사용
+    for _ in range(3):
+        limiter.check(resolve_rate_limit_key(make_request(str(uuid.uuid4()))), now=1000.0)
+    with pytest.raises(HTTPException) as exc_info:
+        limiter.check(resolve_rate_limit_key(make_request(str(uuid.uuid4()))), now=1000.0)
+    assert exc_info.value.status_code == 429
+
+    # 등록된 키는 자기 버킷을 가짐
+    key = resolve_rate_limit_key(make_request("registered"))
+    assert key.startswith("key:")
+    limiter.check(key, now=1000.0)
+
+
+def test_rotating_sessions_does_not_reset_caller_limit(monkeypatch, limits):
+    monkeypatch.setattr(settings, "RATE_LIMIT_KEY_STRATEGY", "session")
+    limiter = RateLimiter(MemoryRateLimitBackend())
+
+    async def scenario():
+        for chat_id in range(3):
+            await limiter.acheck(*resolve_rate_limit_keys(make_request(), chat_id))
+        with pytest.raises(HTTPException):
+            await limiter.acheck(*resolve_rate_limit_keys(make_request(), 99))
+
+    asyncio.run(scenario())
+    assert resolve_rate_limit_keys(make_request(), 7) == ["ip:10.0.0.1", "session:7"]
+
+
+def test_memory_backend_evicts_least_recently_used_keys():
+    backend = MemoryRateLimitBackend(max_keys=3)
+    now = time.time()
+    # 아직 만료되지 않은 키만으로 한도를 넘겨도 크기가 유지되어야 함
+    for index in range(5):
+        backend.take(f"k{index}", 1.0, 3, now=now)
+    backend.take("k2", 1.0, 3, now=now)
+    backend.incr("tokens:k5", 1, 10, ttl=60)
+
+    assert list(backend._expires) == ["k4", "k2", "tokens:k5"]
+    assert set(backend._buckets) == {"k4", "k2"}
@@ -0,0 +1,79 @@
+from sqlalchemy.dialects import mysql
+
+from app import cli
+from app.models import MessageSearch
+from app.schemas.chat import ChatSessionCreate, MessageCreate
+from app.services.archive import archive_service
+from app.services.chat_session_crud import ChatSessionCRUD
+from app.services.message_crud import MessageCRUD
+from app.services.search import MySQLFullTextBackend, search_service
+
+chat_crud = ChatSessionCRUD()
+message_crud = MessageCRUD()
+
+
+def create_session(db, *contents, title="대화"):
+    session = chat_crud.create_session(db, ChatSessionCreate(title=title))
+    messages = [message_crud.create_message(db, MessageCreate(role="user", content=c), session.id) for c in contents]
+    return session, messages
+
+
+def found(db, query):
+    total, items = search_service.search(db, query)
+    assert total == len(items)
+    return sorted(item["id"] for item in items)
+
+
+def test_local_backend_multi_term_short_terms_and_korean(db):
+    _, (lunch, cooker, dinner) = create_session(db, "오늘 점심은 김밥", "밥솥이 고장났어요", "저녁은 김치찌개 Soup")
+    assert search_service.get_backend(db).name == "local"
+
+    assert found(db, "김밥") == [lunch.id]
+    assert found(db, "점심 김밥") == [lunch.id]
+    assert found(db, "점심 김치") == []
+    # ngram 보다 짧은 단어는 부분 문자열로 일치 (접두어만이 아님)
+    assert found(db, "밥") == [lunch.id, cooker.id]
+    assert found(db, "soup 김치") == [dinner.id]
+
+    _, items = search_service.search(db, "김밥")
+    assert items[0]["snippet"] == "오늘 점심은 <mark>김밥</mark>"
+
+
+def test_index_follows_update_delete_and_archive(db):
+    session, (message,) = create_session(db, "첫 번째 내용")
+    session_id, message_id = session.id, message.id
+    message_crud.update_message_content(db, message_id, "고친 내용")
+    assert found(db, "번째") == []
+    assert found(db, "고친") == [message_id]
+
+    chat_crud.delete_session(db, session_id)
+    assert found(db, "고친") == []
+
+    archive_service.archive_sessions(db)
+    assert db.query(MessageSearch).count() == 0
+    archive_service.restore_session(db, session_id)
+    assert db.query(MessageSearch).count() == 1
+
+
+def test_reindex_search_cli(db, capsys):
+    _, (message,) = create_session(db, "다시 색인할 메시지")
+    db.query(MessageSearch).delete()
+    db.commit()
+    assert found(db, "색인") == []
+
+    assert cli.main(["reindex-search"]) == 0
+    assert "검색 색인된 메시지 수: 1" in capsys.readouterr().out
+    assert found(db, "색인") == [message.id]
+
+
+def test_mysql_backend_filters_short_terms_with_like():
+    backend = MySQLFullTextBackend()
+
+    def compile_clause(terms):
+        return str(backend.match_clause(None, terms).compile(dialect=mysql.dialect()))
+
+    assert backend._boolean_query(['김밥"', "+점심"]) == '+"김밥" +"점심"'
+    clause = compile_clause(["김밥", "밥"])
+    assert "MATCH" in clause and "LIKE" in clause
+    assert "MATCH" not in compile_clause(["밥"])
+    assert len(backend.order_by(["밥"])) == 1
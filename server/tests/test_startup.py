@@ -0,0 +1,43 @@
+"""
+콜드 스타트 회귀 테스트
+
+요청 처리 중에만 필요한 무거운 모듈이 app import 시 로드되지 않는지 확인합니다.
+시간 측정값은 장비 부하에 따라 흔들리므로 기본으로는 보고만 하고,
+STARTUP_BUDGET_ENFORCE=1 일 때만 STARTUP_IMPORT_BUDGET_MS / STARTUP_FIRST_REQUEST_BUDGET_MS 예산을 검사합니다.
+(`python -m app.cli startup-profile --import-budget-ms ...` 로도 같은 검사를 할 수 있음)
+"""
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from app.utils.startup_profile import SERVER_ROOT, measure_startup
+
+IMPORT_BUDGET_MS = float(os.environ.get("STARTUP_IMPORT_BUDGET_MS", 2000))
+FIRST_REQUEST_BUDGET_MS = float(os.environ.get("STARTUP_FIRST_REQUEST_BUDGET_MS", 200))
+ENFORCE_BUDGET = os.environ.get("STARTUP_BUDGET_ENFORCE") == "1"
+
+# 요청 처리 중에만 필요한 모듈 (app.main import 시 로드되면 안 됨)
+DEFERRED_MODULES = ["httpx", "pymysql", "pyarrow", "redis", "zstandard"]
+
+
+def test_app_import_defers_request_time_modules():
+    script = (
+        "import json, sys\n"
+        "import app.main\n"
+        f"print(json.dumps([m for m in {DEFERRED_MODULES!r} if m in sys.modules]))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], cwd=SERVER_ROOT, capture_output=True, text=True, check=True
+    )
+    assert json.loads(result.stdout.strip().splitlines()[-1]) == []
+
+
+def test_startup_within_budget():
+    timings = measure_startup(runs=3)
+    if not ENFORCE_BUDGET:
+        pytest.skip(f"startup timings {timings} (set STARTUP_BUDGET_ENFORCE=1 to enforce budgets)")
+    assert timings["import_ms"] <= IMPORT_BUDGET_MS, timings
+    assert timings["first_request_ms"] <= FIRST_REQUEST_BUDGET_MS, timings